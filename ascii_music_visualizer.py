@@ -6,23 +6,91 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import sounddevice as sd
+import scipy.fft
 import threading
-import random
 import time
+from functools import lru_cache
 from matplotlib.patches import Rectangle
 import matplotlib.image as mpimg
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+def _extract_features(mono, magnitude, band_len, out_bands):
+    """Mean-square energy of mono; per-band magnitude means written to out_bands"""
+    energy = 0.0
+    for k in range(mono.shape[0]):
+        energy += mono[k] * mono[k]
+    for b in range(out_bands.shape[0]):
+        acc = 0.0
+        for k in range(b * band_len, (b + 1) * band_len):
+            acc += magnitude[k]
+        out_bands[b] = acc / band_len
+    return energy / mono.shape[0]
+
+
+if HAS_NUMBA:
+    _extract_features = njit(cache=True, fastmath=True)(_extract_features)
+
+
+@lru_cache(maxsize=256)
+def _classify_buckets(energy_b, low_b, mid_b, high_b, beat):
+    """Map bucketed energy (0.05 steps) and band means (0.02 steps) to
+    an (ASCII pattern key, AI image key) pair"""
+    # ASCII pattern by frequency content
+    if beat and energy_b >= 1:
+        pattern_key = 'beat'
+    elif high_b > mid_b and high_b > low_b:
+        pattern_key = 'high'
+    elif mid_b > low_b:
+        pattern_key = 'mid'
+    else:
+        pattern_key = 'low'
+    
+    # AI image by overall energy and spectral tilt
+    if energy_b >= 2:
+        image_key = 'energetic'
+    elif high_b > low_b * 2:
+        image_key = 'treble'
+    elif low_b > high_b * 2:
+        image_key = 'bass'
+    else:
+        image_key = 'calm'
+    
+    return pattern_key, image_key
+
 
 class ASCIIMusicVisualizer:
     def __init__(self):
         self.sample_rate = 22050
         self.buffer_size = 512
-        self.audio_data = np.zeros(1024)
+        self.audio_data = np.zeros(1024, dtype=np.float32)
         self.lock = threading.Lock()
         
+        # Raw block ring filled by the audio thread, analyzed by a worker thread
+        self._n_slots = 8
+        self._raw_ring = np.zeros((self._n_slots, self.buffer_size), dtype=np.float32)
+        self._raw_write = 0  # blocks written so far (only the audio thread writes)
+        self._new_data = threading.Event()
+        self._analysis_thread = None
+        self._running = False
+        
         # Audio analysis
         self.energy = 0
         self.beat = False
-        self.frequency_bands = np.zeros(8)  # 8 frequency bands
+        self.frequency_bands = np.zeros(8, dtype=np.float32)  # 8 frequency bands
+        self._band_len = (self.buffer_size // 2 + 1) // 8  # rfft bins per band
+        
+        # Averages bands [:2], [2:6] and [6:] into low/mid/high in one product
+        self._band_selector = np.array([[.5, 0, 0], [.5, 0, 0],
+                                        [0, .25, 0], [0, .25, 0], [0, .25, 0], [0, .25, 0],
+                                        [0, 0, .5], [0, 0, .5]], dtype=np.float32)
+        
+        # Scratch buffers reused by every process_block call (worker thread only)
+        self._mag_buf = np.empty(self.buffer_size // 2 + 1, dtype=np.float32)
+        self._bands_buf = np.empty(8, dtype=np.float32)
         
         # ASCII art patterns
         self.ascii_patterns = {
@@ -52,6 +120,28 @@ class ASCIIMusicVisualizer:
             ]
         }
         
+        # Static per-column color template for the ASCII grid: each column
+        # follows one frequency band, color = base + intensity * slope
+        self._band_idx = np.arange(10) % 8
+        low, mid = self._band_idx < 2, (self._band_idx >= 2) & (self._band_idx < 6)
+        high = self._band_idx >= 6
+        self._color_base = np.zeros((10, 3))
+        self._color_slope = np.zeros((10, 3))
+        self._color_base[low] = (1, 0, 0)      # Low freq - red
+        self._color_slope[low] = (0, 0.5, 0)
+        self._color_base[mid] = (0, 1, 0)      # Mid freq - green
+        self._color_slope[mid] = (0, 0, 0.5)
+        self._color_base[high] = (0, 0.5, 1)   # High freq - blue
+        self._color_slope[high] = (0.5, 0, 0)
+        
+        # Static 8-entry colormap LUT for the frequency bars
+        self._bar_colors = plt.cm.plasma(np.arange(8) / 8)
+        
+        # Pre-sampled pattern variant indices (every pattern list has 4 variants)
+        self._rng = np.random.default_rng()
+        self._choice_pool = self._rng.integers(0, 4, size=4096)
+        self._choice_i = 0
+        
         # AI-generated image patterns (simulated)
         self.ai_images = {
             'calm': self.generate_calm_pattern(),
@@ -72,40 +162,47 @@ class ASCIIMusicVisualizer:
         
         self.setup_plots()
         
+    def _new_pattern(self, size=50):
+        """Allocate an empty RGB pattern plus broadcastable row/column indices"""
+        pattern = np.empty((size, size, 3), dtype=np.float32)
+        i = np.arange(size, dtype=np.float32)[:, None]
+        j = np.arange(size, dtype=np.float32)[None, :]
+        return pattern, i, j
+    
     def generate_calm_pattern(self):
         """Generate calm AI pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                # Soft blue gradient
-                pattern[i, j] = [0.2 + 0.3*np.sin(i/10), 0.4 + 0.3*np.cos(j/10), 0.8]
+        pattern, i, j = self._new_pattern()
+        # Soft blue gradient
+        pattern[..., 0] = 0.2 + 0.3*np.sin(i/10)
+        pattern[..., 1] = 0.4 + 0.3*np.cos(j/10)
+        pattern[..., 2] = 0.8
         return pattern
     
     def generate_energetic_pattern(self):
         """Generate energetic AI pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                # Dynamic red-yellow pattern
-                pattern[i, j] = [0.8 + 0.2*np.sin(i/5), 0.6 + 0.4*np.cos(j/5), 0.2]
+        pattern, i, j = self._new_pattern()
+        # Dynamic red-yellow pattern
+        pattern[..., 0] = 0.8 + 0.2*np.sin(i/5)
+        pattern[..., 1] = 0.6 + 0.4*np.cos(j/5)
+        pattern[..., 2] = 0.2
         return pattern
     
     def generate_bass_pattern(self):
         """Generate bass-heavy pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                # Deep purple waves
-                pattern[i, j] = [0.5 + 0.3*np.sin(i/8), 0.2, 0.7 + 0.3*np.cos(j/8)]
+        pattern, i, j = self._new_pattern()
+        # Deep purple waves
+        pattern[..., 0] = 0.5 + 0.3*np.sin(i/8)
+        pattern[..., 1] = 0.2
+        pattern[..., 2] = 0.7 + 0.3*np.cos(j/8)
         return pattern
     
     def generate_treble_pattern(self):
         """Generate treble pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                # Bright cyan sparkles
-                pattern[i, j] = [0.2, 0.8 + 0.2*np.sin(i/3), 0.9 + 0.1*np.cos(j/3)]
+        pattern, i, j = self._new_pattern()
+        # Bright cyan sparkles
+        pattern[..., 0] = 0.2
+        pattern[..., 1] = 0.8 + 0.2*np.sin(i/3)
+        pattern[..., 2] = 0.9 + 0.1*np.cos(j/3)
         return pattern
     
     def setup_plots(self):
@@ -128,65 +225,109 @@ class ASCIIMusicVisualizer:
         self.ax_image.set_ylim(0, 1)
         self.ax_image.axis('off')
         self.ax_image.set_title('🤖 AI Generated Art', color='lime', fontsize=12)
+        
+        # Persistent artists, updated in place by update_frame
+        self._rows, self._cols = 8, 10
+        self._texts = [[self.ax_main.text(col, self._rows - row, ' ',
+                                          fontsize=20, ha='center', va='center',
+                                          weight='bold')
+                        for col in range(self._cols)]
+                       for row in range(self._rows)]
+        self._rowcol_sum = np.add.outer(np.arange(self._rows), np.arange(self._cols))
+        self._status_text = self.ax_main.text(0.5, 9.5, '', color='white', fontsize=12, ha='left')
+        
+        # Waveform is drawn as min/max pairs per 8-sample bucket (256 vertices)
+        self._wave_ds = 8
+        self._wave_x = np.repeat(np.arange(1024 // self._wave_ds, dtype=np.float32) * self._wave_ds, 2)
+        self._waveline, = self.ax_waveform.plot(self._wave_x, np.zeros_like(self._wave_x),
+                                                color='cyan', linewidth=1)
+        
+        bar_width = 1024 // 8
+        self._bars = self.ax_waveform.bar(np.arange(8) * bar_width, np.zeros(8), bar_width,
+                                          alpha=0.7, color=self._bar_colors,
+                                          bottom=-1)
+        self._band_text = self.ax_waveform.text(10, 0.8, '', color='yellow', fontsize=8)
+        self._band_fmt = "B1:%.2f | B2:%.2f | B3:%.2f | B4:%.2f"
+        
+        self._imshow = self.ax_image.imshow(self.ai_images['calm'], aspect='auto')
+        
+        # Everything update_frame mutates; blitting redraws only these over
+        # the cached axes backgrounds (titles and styling are never cleared)
+        self._artists = [self._waveline, self._imshow, self._status_text, self._band_text,
+                         *self._bars, *(t for row in self._texts for t in row)]
+    
+    def init_frame(self):
+        """Initial blit frame: hand the persistent artists to FuncAnimation"""
+        return self._artists
     
     def audio_callback(self, indata, frames, time, status):
+        """Copy the raw block into the ring and wake the analysis thread"""
+        slot = self._raw_ring[self._raw_write % self._n_slots]
+        if indata.shape[1] > 1:
+            np.mean(indata, axis=1, out=slot)
+        else:
+            slot[:] = indata[:, 0]
+        self._raw_write += 1
+        self._new_data.set()
+    
+    def _analysis_loop(self):
+        """Worker thread: analyze the newest raw block whenever one arrives"""
+        while self._running:
+            if not self._new_data.wait(timeout=0.1):
+                continue
+            self._new_data.clear()
+            self.process_block(self._raw_ring[(self._raw_write - 1) % self._n_slots])
+    
+    def process_block(self, mono):
         """Process audio and extract features"""
-        mono = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
+        # Frequency analysis (simplified)
+        fft = scipy.fft.rfft(mono, n=self.buffer_size, workers=1)
+        magnitude = np.abs(fft, out=self._mag_buf)
+        bands = self._bands_buf
         
-        # Energy calculation
-        energy = np.mean(mono ** 2)
+        if HAS_NUMBA:
+            # Energy and band means fused into one compiled pass
+            energy = _extract_features(mono, magnitude, self._band_len, bands)
+        else:
+            # Energy calculation
+            energy = np.mean(mono ** 2)
+            
+            # Split into frequency bands (one reduction over an 8-row view)
+            np.mean(magnitude[:8 * self._band_len].reshape(8, self._band_len), axis=1, out=bands)
         
         # Beat detection
         beat = energy > 0.02
         
-        # Frequency analysis (simplified)
-        fft = np.fft.rfft(mono)
-        freqs = np.fft.rfftfreq(len(mono), 1/self.sample_rate)
-        magnitude = np.abs(fft)
-        
-        # Split into frequency bands
-        bands = np.zeros(8)
-        band_size = len(magnitude) // 8
-        for i in range(8):
-            start = i * band_size
-            end = (i + 1) * band_size
-            bands[i] = np.mean(magnitude[start:end])
-        
         with self.lock:
-            self.audio_data = mono[-1024:] if len(mono) >= 1024 else np.pad(mono, (0, 1024-len(mono)))
+            # Shift the rolling 1024-sample history in place
+            n = len(mono)
+            if n >= 1024:
+                self.audio_data[:] = mono[-1024:]
+            else:
+                self.audio_data[:-n] = self.audio_data[n:]
+                self.audio_data[-n:] = mono
             self.energy = energy
             self.beat = beat
-            self.frequency_bands = bands
+            self.frequency_bands[:] = bands
     
-    def select_ascii_pattern(self):
+    def classify_audio(self, energy, beat, bands):
+        """Quantize audio features and look up the (cached) pattern/image decision"""
+        low_energy, mid_energy, high_energy = bands @ self._band_selector
+        return _classify_buckets(int(energy * 20), int(low_energy * 50),
+                                 int(mid_energy * 50), int(high_energy * 50), bool(beat))
+    
+    def select_ascii_pattern(self, pattern_key):
         """AI-powered ASCII pattern selection"""
-        # Analyze frequency content
-        low_energy = np.mean(self.frequency_bands[:2])
-        mid_energy = np.mean(self.frequency_bands[2:6])
-        high_energy = np.mean(self.frequency_bands[6:])
-        
-        if self.beat and self.energy > 0.05:
-            return random.choice(self.ascii_patterns['beat'])
-        elif high_energy > mid_energy and high_energy > low_energy:
-            return random.choice(self.ascii_patterns['high'])
-        elif mid_energy > low_energy:
-            return random.choice(self.ascii_patterns['mid'])
-        else:
-            return random.choice(self.ascii_patterns['low'])
+        idx = self._choice_pool[self._choice_i]
+        self._choice_i = (self._choice_i + 1) & 4095
+        if self._choice_i == 0:
+            # Pool exhausted, redraw it in one vectorized call
+            self._choice_pool = self._rng.integers(0, 4, size=4096)
+        return self.ascii_patterns[pattern_key][idx]
     
-    def select_ai_image(self):
+    def select_ai_image(self, image_key):
         """Select AI image based on music analysis"""
-        low_energy = np.mean(self.frequency_bands[:2])
-        high_energy = np.mean(self.frequency_bands[6:])
-        
-        if self.energy > 0.1:
-            return self.ai_images['energetic']
-        elif high_energy > low_energy * 2:
-            return self.ai_images['treble']
-        elif low_energy > high_energy * 2:
-            return self.ai_images['bass']
-        else:
-            return self.ai_images['calm']
+        return self.ai_images[image_key]
     
     def update_frame(self, frame):
         """Update visualization"""
@@ -196,69 +337,39 @@ class ASCIIMusicVisualizer:
             beat = self.beat
             bands = self.frequency_bands.copy()
         
-        # Clear all plots
-        self.ax_main.clear()
-        self.ax_waveform.clear()
-        self.ax_image.clear()
+        # Draw ASCII art
+        pattern_key, image_key = self.classify_audio(energy, beat, bands)
+        ascii_pattern = self.select_ascii_pattern(pattern_key)
         
-        # Setup plots again
-        self.setup_plots()
+        # Column colors only depend on the band intensity, not on the row
+        intensity = np.minimum(1.0, bands[self._band_idx] * 1000)
+        col_colors = (self._color_base + intensity[:, None] * self._color_slope).tolist()
+        char_idx = ((self._rowcol_sum + frame // 10) % len(ascii_pattern)).tolist()
         
-        # Draw ASCII art
-        ascii_pattern = self.select_ascii_pattern()
-        
-        # Create ASCII grid
-        rows = 8
-        cols = 10
-        for row in range(rows):
-            for col in range(cols):
-                # Vary intensity based on frequency bands
-                band_idx = col % 8
-                intensity = min(1.0, bands[band_idx] * 1000)
-                
-                # Color based on frequency
-                if band_idx < 2:  # Low freq - red
-                    color = (1, intensity * 0.5, 0)
-                elif band_idx < 6:  # Mid freq - green
-                    color = (0, 1, intensity * 0.5)
-                else:  # High freq - blue
-                    color = (intensity * 0.5, 0.5, 1)
-                
-                # Draw character
-                char_idx = (row + col + frame//10) % len(ascii_pattern)
-                if char_idx < len(ascii_pattern):
-                    char = ascii_pattern[char_idx] if char_idx < len(ascii_pattern) else '█'
-                    self.ax_main.text(col, rows-row, char, 
-                                    color=color, fontsize=20, 
-                                    ha='center', va='center',
-                                    weight='bold')
+        # Update ASCII grid (only artist setters left in the loop)
+        for text_row, idx_row in zip(self._texts, char_idx):
+            for text, idx, color in zip(text_row, idx_row, col_colors):
+                text.set_text(ascii_pattern[idx])
+                text.set_color(color)
         
         # Draw waveform
-        if len(audio) > 0:
-            self.ax_waveform.plot(audio, color='cyan', linewidth=1)
-            self.ax_waveform.fill_between(range(len(audio)), audio, alpha=0.3, color='cyan')
+        buckets = audio.reshape(-1, self._wave_ds)
+        self._waveline.set_ydata(np.stack((buckets.min(axis=1), buckets.max(axis=1)), axis=1).ravel())
         
         # Draw frequency bars
-        bar_width = len(audio) // 8
-        for i, band in enumerate(bands):
-            height = min(1.0, band * 500)
-            color = plt.cm.plasma(i / 8)
-            self.ax_waveform.bar(i * bar_width, height, bar_width, 
-                               alpha=0.7, color=color, bottom=-1)
+        for bar, band in zip(self._bars, bands):
+            bar.set_height(min(1.0, band * 500))
         
         # Display AI image
-        ai_image = self.select_ai_image()
-        self.ax_image.imshow(ai_image, aspect='auto')
+        self._imshow.set_data(self.select_ai_image(image_key))
         
         # Add status text
-        self.ax_main.text(0.5, 9.5, f'Energy: {energy:.3f} | Beat: {"🔥" if beat else "💤"}', 
-                         color='white', fontsize=12, ha='left')
+        self._status_text.set_text(f'Energy: {energy:.3f} | Beat: {"🔥" if beat else "💤"}')
         
         # Band display
-        band_text = " | ".join([f"B{i+1}:{bands[i]:.2f}" for i in range(4)])
-        self.ax_waveform.text(10, 0.8, band_text, color='yellow', fontsize=8)
+        self._band_text.set_text(self._band_fmt % (bands[0], bands[1], bands[2], bands[3]))
         
-        return []
+        return self._artists
     
     def start(self):
         """Start the ASCII music visualizer"""
@@ -277,6 +388,11 @@ class ASCIIMusicVisualizer:
                     print(f"[DEVICE] Using: {device['name']}")
                     break
             
+            # Start feature extraction worker
+            self._running = True
+            self._analysis_thread = threading.Thread(target=self._analysis_loop, daemon=True)
+            self._analysis_thread.start()
+            
             # Start audio stream
             with sd.InputStream(device=device_id,
                               channels=1,
@@ -286,8 +402,9 @@ class ASCIIMusicVisualizer:
                               dtype=np.float32):
                 
                 # Start animation
-                self.ani = animation.FuncAnimation(self.fig, self.update_frame, 
-                                                 interval=150, blit=False, cache_frame_data=False)
+                self.ani = animation.FuncAnimation(self.fig, self.update_frame,
+                                                 init_func=self.init_frame,
+                                                 interval=150, blit=True, cache_frame_data=False)
                 
                 plt.tight_layout()
                 plt.show(block=True)
@@ -296,6 +413,8 @@ class ASCIIMusicVisualizer:
             print("\n[STOP] ASCII visualizer stopped")
         except Exception as e:
             print(f"[ERROR] {e}")
+        finally:
+            self._running = False
 
 def main():
     visualizer = ASCIIMusicVisualizer()
@@ -3,8 +3,6 @@ Core audio capture and processing engine
 """
 import sounddevice as sd
 import numpy as np
-import threading
-from collections import deque
 from typing import Optional, Callable, List, Tuple
 
 
@@ -15,19 +13,25 @@ class AudioEngine:
         self.buffer_size = buffer_size
         self.window_samples = int(sample_rate * window_duration)
         
-        # Rolling buffer for visualization
-        self.audio_buffer = deque(maxlen=self.window_samples)
-        self.lock = threading.Lock()
+        # Rolling buffer for visualization (preallocated ring, oldest sample at _write).
+        # Single producer (audio thread) / single consumer without a lock: the
+        # writer publishes _write with one attribute store after copying the
+        # block, and a reader racing it can only see the oldest samples change.
+        self._buf = np.zeros(self.window_samples, dtype=np.float32)
+        self._write = 0
         self.stream = None
         self.is_running = False
         
         # Callbacks
         self.data_callback: Optional[Callable] = None
         
-    def list_devices(self) -> List[Tuple[int, str, bool]]:
+    def list_devices(self, devices_info=None) -> List[Tuple[int, str, bool]]:
         """List available audio devices with loopback capability"""
+        if devices_info is None:
+            devices_info = sd.query_devices()
+        
         devices = []
-        for i, device in enumerate(sd.query_devices()):
+        for i, device in enumerate(devices_info):
             # Check for loopback or stereo mix capability
             is_loopback = ('stereo mix' in device['name'].lower() or 
                           'loopback' in device['name'].lower() or
@@ -38,7 +42,9 @@ class AudioEngine:
     
     def find_loopback_device(self) -> Optional[int]:
         """Auto-detect system loopback device"""
-        devices = self.list_devices()
+        # Query PortAudio once and reuse the result for every candidate
+        devices_info = sd.query_devices()
+        devices = self.list_devices(devices_info)
         
         # Priority order for loopback detection
         priorities = ['stereo mix', 'loopback', 'what u hear', 'speakers', 'headphones']
@@ -48,7 +54,7 @@ class AudioEngine:
                 if priority in name.lower():
                     try:
                         # Test if device supports input
-                        device_info = sd.query_devices(device_id)
+                        device_info = devices_info[device_id]
                         if device_info['max_input_channels'] > 0:
                             return device_id
                     except:
@@ -71,13 +77,30 @@ class AudioEngine:
         else:
             audio_data = indata[:, 0]
         
-        with self.lock:
-            self.audio_buffer.extend(audio_data)
+        self._write_ring(audio_data)
         
         # Trigger data callback if set
         if self.data_callback:
             self.data_callback(audio_data)
     
+    def _write_ring(self, audio_data: np.ndarray):
+        """Copy a block of samples into the ring buffer, wrapping at the end"""
+        size = self.window_samples
+        n = len(audio_data)
+        if n >= size:
+            self._buf[:] = audio_data[-size:]
+            self._write = 0
+            return
+        
+        end = self._write + n
+        if end <= size:
+            self._buf[self._write:end] = audio_data
+        else:
+            split = size - self._write
+            self._buf[self._write:] = audio_data[:split]
+            self._buf[:n - split] = audio_data[split:]
+        self._write = end % size
+    
     def start_capture(self, device_id: Optional[int] = None) -> bool:
         """Start audio capture"""
         if self.is_running:
@@ -121,10 +144,31 @@ class AudioEngine:
     
     def get_audio_data(self) -> np.ndarray:
         """Get current audio buffer data"""
-        with self.lock:
-            if len(self.audio_buffer) == 0:
-                return np.zeros(self.window_samples)
-            return np.array(list(self.audio_buffer))
+        write = self._write
+        return np.concatenate((self._buf[write:], self._buf[:write]))
+    
+    def get_audio_view(self) -> np.ndarray:
+        """Get a zero-copy, read-only view of the raw ring buffer.
+        
+        Samples are not in temporal order: the oldest one sits at the current
+        write index. Order-independent reductions (RMS, peak) can use the view
+        directly without copying the window.
+        """
+        view = self._buf.view()
+        view.flags.writeable = False
+        return view
+    
+    def __array__(self, dtype=None, copy=None):
+        """Allow np.asarray(engine) to yield the window in temporal order.
+        
+        Unrolling the ring always copies, so copy=False raises ValueError as
+        the NumPy 2 protocol requires; use get_audio_view() for a zero-copy view.
+        """
+        if copy is False:
+            raise ValueError("AudioEngine cannot provide its window without a copy; "
+                             "use get_audio_view() for the raw ring")
+        data = self.get_audio_data()
+        return data if dtype is None else data.astype(dtype, copy=False)
     
     def set_data_callback(self, callback: Callable):
         """Set callback for real-time data processing"""
@@ -0,0 +1,62 @@
+"""
+Shared per-block audio analysis kernels for the real-time visualizers
+Compiled with numba when it is installed, plain NumPy otherwise
+"""
+import math
+
+import numpy as np
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _process_audio(mono, beat_threshold):
+    """Mean-square energy of a float32 block and whether it clears beat_threshold"""
+    energy = 0.0
+    for k in range(mono.shape[0]):
+        energy += mono[k] * mono[k]
+    energy /= mono.shape[0]
+    return energy, energy > beat_threshold
+
+
+def _band_means(magnitude, band_len, out_bands):
+    """Mean of each consecutive band_len-bin slice of magnitude, written to out_bands"""
+    for b in range(out_bands.shape[0]):
+        acc = 0.0
+        for k in range(b * band_len, (b + 1) * band_len):
+            acc += magnitude[k]
+        out_bands[b] = acc / band_len
+
+
+def _magnitude_db(re, im, out):
+    """20*log10(|re + j*im| + 1e-10) per bin, written to out"""
+    for k in range(out.shape[0]):
+        out[k] = 20.0 * math.log10(math.sqrt(re[k] * re[k] + im[k] * im[k]) + 1e-10)
+
+
+if HAS_NUMBA:
+    # Explicit signatures compile at import (and are cached on disk), so the
+    # first audio callback never pays for compilation
+    process_audio = njit('Tuple((f8, b1))(f4[:], f8)', cache=True, fastmath=True)(_process_audio)
+    band_means = njit('void(f4[:], i8, f4[:])', cache=True, fastmath=True)(_band_means)
+    magnitude_db = njit('void(f4[:], f4[:], f4[:])', cache=True, fastmath=True)(_magnitude_db)
+else:
+    def process_audio(mono, beat_threshold):
+        """Mean-square energy of a float32 block and whether it clears beat_threshold"""
+        energy = float(np.dot(mono, mono)) / len(mono)
+        return energy, energy > beat_threshold
+
+    def band_means(magnitude, band_len, out_bands):
+        """Mean of each consecutive band_len-bin slice of magnitude, written to out_bands"""
+        n_bands = len(out_bands)
+        np.add.reduceat(magnitude[:n_bands * band_len], np.arange(n_bands) * band_len, out=out_bands)
+        out_bands /= band_len
+
+    def magnitude_db(re, im, out):
+        """20*log10(|re + j*im| + 1e-10) per bin, written to out"""
+        np.hypot(re, im, out=out)
+        out += 1e-10
+        np.log10(out, out=out)
+        out *= 20
@@ -6,12 +6,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import sounddevice as sd
+import scipy.fft
 import threading
-import random
 import time
 from matplotlib.patches import Rectangle
 import matplotlib.image as mpimg
 from matplotlib.gridspec import GridSpec
+from matplotlib.colors import to_rgba_array
+from matplotlib.collections import LineCollection
 
 def clamp(value, minimum=0, maximum=1):
     """Clamp a value between minimum and maximum"""
@@ -21,16 +23,29 @@ class CombinedMusicVisualizer:
     def __init__(self):
         self.sample_rate = 44100
         self.buffer_size = 1024
-        self.audio_data = np.zeros(1024)
+        self.audio_data = np.zeros(self.buffer_size, dtype=np.float32)
         self.lock = threading.Lock()
         
         # Audio analysis
         self.energy = 0
         self.beat = False
-        self.frequency_bands = np.zeros(8)
+        self.frequency_bands = np.zeros(8, dtype=np.float32)
+        self._band_size = (self.buffer_size // 2 + 1) // 8  # rfft bins per band
+        self._band_starts = np.arange(8) * self._band_size
+        # Low/mid/high ranges over the 8 bands: [0, 2), [2, 6), [6, 8)
+        self._range_starts = np.array([0, 2, 6])
+        self._range_scale = np.array([1 / 2, 1 / 4, 1 / 2], dtype=np.float32)
         self.neural_activation = 0
         self.last_energy = 0
-        self.energy_history = []
+        self.energy_history = np.zeros(50, dtype=np.float32)  # ring of recent energies
+        self._energy_i = 0
+        self._energy_n = 0
+        self._energy_sum = 0.0  # running sum of the ring's filled slots
+        
+        # Scratch buffers reused by every audio callback
+        self._mono = np.zeros(self.buffer_size, dtype=np.float32)
+        self._mag = np.empty(self.buffer_size // 2 + 1, dtype=np.float32)
+        self._bands = np.empty(8, dtype=np.float32)
         self.sensitivity = 1.0  # Adjustable sensitivity
         
         # ASCII art patterns
@@ -61,9 +76,27 @@ class CombinedMusicVisualizer:
             ]
         }
         
+        # Static per-column color template for the ASCII grid: each column
+        # follows one frequency band, color = base + intensity * slope
+        self._ascii_band_idx = np.arange(10) % 8
+        low = self._ascii_band_idx < 2
+        mid = (self._ascii_band_idx >= 2) & (self._ascii_band_idx < 6)
+        high = self._ascii_band_idx >= 6
+        self._ascii_color_base = np.zeros((10, 3), dtype=np.float32)
+        self._ascii_color_slope = np.zeros((10, 3), dtype=np.float32)
+        self._ascii_color_base[low] = (1, 0, 0)
+        self._ascii_color_slope[low] = (0, 0.5, 0)
+        self._ascii_color_base[mid] = (0, 1, 0)
+        self._ascii_color_slope[mid] = (0, 0, 0.5)
+        self._ascii_color_base[high] = (0, 0.5, 1)
+        self._ascii_color_slope[high] = (0.5, 0, 0)
+        
+        # Static 8-entry colormap LUT for the spectrum bars
+        self._bar_colors = plt.cm.plasma(np.arange(8) / 8)
+        
         # Neural network nodes
-        self.neural_nodes = []
-        self.particles = []
+        self._rng = np.random.default_rng()
+        self.init_particles()
         self.explosions = []
         self.init_neural_network()
         
@@ -74,6 +107,8 @@ class CombinedMusicVisualizer:
             'bass': self.generate_bass_pattern(),
             'treble': self.generate_treble_pattern()
         }
+        for pattern in self.ai_images.values():
+            np.clip(pattern, 0, 1, out=pattern)
         
         # Setup fullscreen visualization
         plt.style.use('dark_background')
@@ -143,47 +178,76 @@ class CombinedMusicVisualizer:
             print(f"[WARNING] Error finding audio device: {e}")
             return None
         
-    def init_neural_network(self):
-        """Initialize neural network nodes"""
-        for i in range(20):
-            x = random.uniform(-1, 1)
-            y = random.uniform(-1, 1)
-            self.neural_nodes.append({
-                'x': x, 'y': y,
-                'activation': 0,
-                'connections': random.randint(2, 5)
-            })
+    def init_particles(self, capacity=2048):
+        """Allocate particle storage as parallel arrays (first n_particles rows are live)"""
+        self.particle_xy = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_v = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_life = np.zeros(capacity, dtype=np.float32)
+        self.particle_color = np.zeros(capacity, dtype=np.int8)
+        self.particle_palette = to_rgba_array(['cyan', 'magenta', 'yellow', 'lime']).astype(np.float32)
+        self.n_particles = 0
+    
+    def spawn_particles(self, x, y, angle, speed):
+        """Append a burst of particles starting at (x, y)"""
+        with self.lock:
+            start = self.n_particles
+            count = min(len(angle), len(self.particle_life) - start)
+            end = start + count
+            self.particle_xy[start:end] = (x, y)
+            self.particle_v[start:end, 0] = np.cos(angle[:count]) * speed[:count]
+            self.particle_v[start:end, 1] = np.sin(angle[:count]) * speed[:count]
+            self.particle_life[start:end] = 1.0
+            self.particle_color[start:end] = self._rng.integers(0, len(self.particle_palette), count)
+            self.n_particles = end
+    
+    def init_neural_network(self, n_nodes=20):
+        """Initialize neural network nodes as parallel position/activation/fan-out arrays"""
+        self.node_xy = self._rng.uniform(-1, 1, (n_nodes, 2)).astype(np.float32)
+        self.node_act = np.zeros(n_nodes, dtype=np.float32)
+        self.node_conn = self._rng.integers(2, 6, n_nodes).astype(np.int8)
+        
+        # Fixed edges as index arrays: node i links forward to its next (connections - 1) nodes
+        pair_i, pair_j = np.triu_indices(n_nodes, 1)
+        linked = pair_j < pair_i + self.node_conn[pair_i]
+        self._edge_i, self._edge_j = pair_i[linked], pair_j[linked]
+    
+    def _new_pattern(self, size=50):
+        """Allocate an empty RGB pattern plus broadcastable row/column indices"""
+        pattern = np.empty((size, size, 3), dtype=np.float32)
+        i = np.arange(size, dtype=np.float32)[:, None]
+        j = np.arange(size, dtype=np.float32)[None, :]
+        return pattern, i, j
     
     def generate_calm_pattern(self):
         """Generate calm AI pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                pattern[i, j] = [0.2 + 0.3*np.sin(i/10), 0.4 + 0.3*np.cos(j/10), 0.8]
+        pattern, i, j = self._new_pattern()
+        pattern[..., 0] = 0.2 + 0.3*np.sin(i/10)
+        pattern[..., 1] = 0.4 + 0.3*np.cos(j/10)
+        pattern[..., 2] = 0.8
         return pattern
     
     def generate_energetic_pattern(self):
         """Generate energetic pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                pattern[i, j] = [0.8 + 0.2*np.sin(i/5), 0.6 + 0.4*np.cos(j/5), 0.2]
+        pattern, i, j = self._new_pattern()
+        pattern[..., 0] = 0.8 + 0.2*np.sin(i/5)
+        pattern[..., 1] = 0.6 + 0.4*np.cos(j/5)
+        pattern[..., 2] = 0.2
         return pattern
     
     def generate_bass_pattern(self):
         """Generate bass pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                pattern[i, j] = [0.5 + 0.3*np.sin(i/8), 0.2, 0.7 + 0.3*np.cos(j/8)]
+        pattern, i, j = self._new_pattern()
+        pattern[..., 0] = 0.5 + 0.3*np.sin(i/8)
+        pattern[..., 1] = 0.2
+        pattern[..., 2] = 0.7 + 0.3*np.cos(j/8)
         return pattern
     
     def generate_treble_pattern(self):
         """Generate treble pattern"""
-        pattern = np.zeros((50, 50, 3))
-        for i in range(50):
-            for j in range(50):
-                pattern[i, j] = [0.2, 0.8 + 0.2*np.sin(i/3), 0.9 + 0.1*np.cos(j/3)]
+        pattern, i, j = self._new_pattern()
+        pattern[..., 0] = 0.2
+        pattern[..., 1] = 0.8 + 0.2*np.sin(i/3)
+        pattern[..., 2] = 0.9 + 0.1*np.cos(j/3)
         return pattern
     
     def setup_plots(self):
@@ -194,6 +258,12 @@ class CombinedMusicVisualizer:
         self.ax_ascii.set_facecolor('black')
         self.ax_ascii.axis('off')
         self.ax_ascii.set_title('🎨 ASCII Art', color='white', fontsize=12)
+        # One persistent Text per cell, glyphs in their band colour on black;
+        # frames recolour the columns and only reset the glyphs when the pattern moves
+        self._ascii_texts = [[self.ax_ascii.text(col, 8 - row, '', fontsize=20,
+                                                 ha='center', va='center', weight='bold')
+                              for col in range(10)] for row in range(8)]
+        self._ascii_key = None
         
         # Neural network area
         self.ax_neural.set_xlim(-1.2, 1.2)
@@ -201,24 +271,51 @@ class CombinedMusicVisualizer:
         self.ax_neural.set_facecolor('black')
         self.ax_neural.axis('off')
         self.ax_neural.set_title('🧠 Neural Network', color='cyan', fontsize=12)
+        self._edge_lc = LineCollection([], colors='cyan')
+        self.ax_neural.add_collection(self._edge_lc)
+        self._status_text = self.ax_neural.text(0.01, 0.99, '', color='white', fontsize=10,
+                                                va='top', transform=self.ax_neural.transAxes)
+        self._node_pc = self.ax_neural.scatter(self.node_xy[:, 0], self.node_xy[:, 1], s=50,
+                                               alpha=0.8, edgecolors='white', linewidth=1)
+        self._particle_pc = self.ax_neural.scatter(np.empty(0), np.empty(0))
+        self._explosion_pool = [self.ax_neural.add_patch(plt.Circle((0, 0), 0, fill=False, color='red',
+                                                                    linewidth=2, visible=False))
+                                for _ in range(16)]
         
         # AI art area
         self.ax_ai.set_xlim(0, 1)
         self.ax_ai.set_ylim(0, 1)
         self.ax_ai.axis('off')
         self.ax_ai.set_title('🤖 AI Art', color='lime', fontsize=12)
+        self._ai_im = self.ax_ai.imshow(self.ai_images['calm'], aspect='auto')
         
         # Waveform area
         self.ax_wave.set_xlim(0, 1024)
         self.ax_wave.set_ylim(-1, 1)
         self.ax_wave.set_facecolor('black')
         self.ax_wave.set_title('🎵 Waveform', color='yellow', fontsize=12)
+        self._wave_x = np.arange(self.buffer_size, dtype=np.float32)
+        self._wave_line, = self.ax_wave.plot(self._wave_x, np.zeros_like(self._wave_x), color='cyan', linewidth=1)
+        self._wave_fill = self.ax_wave.fill_between(self._wave_x, np.zeros_like(self._wave_x), alpha=0.3, color='cyan')
+        # Fill polygon: waveform out along the top, zero baseline back; only the top y's change
+        self._wave_fill_xy = np.zeros((2 * self.buffer_size, 2), dtype=np.float32)
+        self._wave_fill_xy[:, 0] = np.concatenate((self._wave_x, self._wave_x[::-1]))
         
         # Spectrum area
         self.ax_spectrum.set_xlim(0, 8)
         self.ax_spectrum.set_ylim(0, 1)
         self.ax_spectrum.set_facecolor('black')
         self.ax_spectrum.set_title('📊 Frequency Spectrum', color='magenta', fontsize=12)
+        self._bars = self.ax_spectrum.bar(np.arange(8), np.zeros(8), width=0.8, alpha=0.7,
+                                          color=self._bar_colors)
+        
+        # Static figure title; the artists above are updated in place by update_frame
+        self.fig.suptitle('🎼 Combined Music Visualizer', color='white',
+                         fontsize=16, weight='bold', y=0.98)
+        self._artists = [self._edge_lc, self._node_pc, self._particle_pc,
+                         *self._explosion_pool, self._status_text, self._ai_im, self._wave_line,
+                         self._wave_fill, *self._bars,
+                         *(text for row in self._ascii_texts for text in row)]
     
     def audio_callback(self, indata, frames, time, status):
         """Process audio input"""
@@ -227,41 +324,41 @@ class CombinedMusicVisualizer:
             
         try:
             # Convert to mono and normalize
-            audio_data = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
+            audio_data = np.mean(indata, axis=1, out=self._mono)
             
             # Energy calculation with sensitivity adjustment
-            energy = np.mean(audio_data ** 2) * self.sensitivity
-            self.energy_history.append(energy)
-            if len(self.energy_history) > 50:
-                self.energy_history.pop(0)
+            energy = float(np.dot(audio_data, audio_data)) / len(audio_data) * self.sensitivity
+            evicted = float(self.energy_history[self._energy_i])
+            self.energy_history[self._energy_i] = energy
+            self._energy_sum += float(self.energy_history[self._energy_i]) - evicted
+            self._energy_i = (self._energy_i + 1) % len(self.energy_history)
+            self._energy_n = min(self._energy_n + 1, len(self.energy_history))
                 
             # Normalize energy for visualization
             energy = clamp(energy, 0, 1)
                 
             # Beat detection
-            beat = energy > 0.02 and energy > np.mean(self.energy_history) * 1.5
+            beat = energy > 0.02 and energy > self._energy_sum / self._energy_n * 1.5
             
             # Frequency analysis
-            fft = np.fft.rfft(audio_data)
-            magnitude = np.abs(fft)
+            fft = scipy.fft.rfft(audio_data, n=self.buffer_size, workers=1)
+            magnitude = np.abs(fft, out=self._mag)
             
-            # Split into frequency bands and normalize
-            bands = np.zeros(8)
-            band_size = len(magnitude) // 8
-            for i in range(8):
-                start = i * band_size
-                end = (i + 1) * band_size
-                bands[i] = clamp(np.mean(magnitude[start:end]) * self.sensitivity)
+            # Split into frequency bands (one reduceat over the band boundaries) and normalize
+            bands = np.add.reduceat(magnitude[:8 * self._band_size], self._band_starts,
+                                    out=self._bands)
+            bands *= self.sensitivity / self._band_size
+            np.clip(bands, 0, 1, out=bands)
             
             # Neural activation with clamping
             energy_delta = energy - self.last_energy
             neural_activation = clamp(energy_delta * 10)  # Reduced multiplier from 1000 to 10
             
             with self.lock:
-                self.audio_data = audio_data[-1024:]
+                self.audio_data[:] = audio_data
                 self.energy = energy
                 self.beat = beat
-                self.frequency_bands = bands
+                self.frequency_bands[:] = bands
                 self.neural_activation = neural_activation
                 self.last_energy = energy
                 
@@ -276,72 +373,78 @@ class CombinedMusicVisualizer:
         """Create neural explosion effect"""
         intensity = clamp(intensity)  # Ensure intensity is in valid range
         num_particles = int(intensity * 50)  # Reduced from 500 to 50
-        center_x = random.uniform(-0.5, 0.5)
-        center_y = random.uniform(-0.5, 0.5)
+        center_x, center_y = self._rng.uniform(-0.5, 0.5, 2)
         
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * np.pi)
-            speed = random.uniform(0.1, 0.3)  # Reduced max speed
-            self.particles.append({
+        angle = self._rng.uniform(0, 2 * np.pi, num_particles)
+        speed = self._rng.uniform(0.1, 0.3, num_particles)  # Reduced max speed
+        self.spawn_particles(center_x, center_y, angle, speed)
+            
+        with self.lock:
+            self.explosions.append({
                 'x': center_x,
                 'y': center_y,
-                'vx': np.cos(angle) * speed,
-                'vy': np.sin(angle) * speed,
-                'life': 1.0,
-                'color': random.choice(['cyan', 'magenta', 'yellow', 'lime'])
+                'radius': 0.1,
+                'max_radius': clamp(intensity) * 1.5,  # Reduced multiplier
+                'life': 1.0
             })
-            
-        self.explosions.append({
-            'x': center_x,
-            'y': center_y,
-            'radius': 0.1,
-            'max_radius': clamp(intensity) * 1.5,  # Reduced multiplier
-            'life': 1.0
-        })
+            # The circle pool bounds how many can be drawn: keep state in step, oldest out
+            if len(self.explosions) > len(self._explosion_pool):
+                del self.explosions[0]
     
     def update_neural_network(self):
         """Update neural network state"""
-        for node in self.neural_nodes:
-            node['activation'] = clamp(self.energy * 2 + random.uniform(0, 0.1))  # Reduced multipliers
-            node['x'] += random.uniform(-0.01, 0.01)
-            node['y'] += random.uniform(-0.01, 0.01)
-            node['x'] = clamp(node['x'], -1, 1)
-            node['y'] = clamp(node['y'], -1, 1)
+        noise = self._rng.uniform(0, 0.1, len(self.node_act))
+        self.node_act[:] = np.clip(self.energy * 2 + noise, 0, 1)  # Reduced multipliers
+        self.node_xy += self._rng.uniform(-0.01, 0.01, self.node_xy.shape)
+        np.clip(self.node_xy, -1, 1, out=self.node_xy)
     
     def update_particles(self):
         """Update particle effects"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx'] * 0.02
-            particle['y'] += particle['vy'] * 0.02
-            particle['life'] -= 0.05
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-                
-        for explosion in self.explosions[:]:
-            explosion['radius'] += 0.1
-            explosion['life'] -= 0.1
-            if explosion['life'] <= 0 or explosion['radius'] > explosion['max_radius']:
-                self.explosions.remove(explosion)
+        with self.lock:
+            n = self.n_particles
+            self.particle_xy[:n] += self.particle_v[:n] * 0.02
+            self.particle_life[:n] -= 0.05
+            
+            # Compact live particles to the front of the arrays
+            alive = self.particle_life[:n] > 0
+            n_alive = int(np.count_nonzero(alive))
+            if n_alive < n:
+                for arr in (self.particle_xy, self.particle_v, self.particle_life, self.particle_color):
+                    arr[:n_alive] = arr[:n][alive]
+                self.n_particles = n_alive
+            
+            for explosion in self.explosions:
+                explosion['radius'] += 0.1
+                explosion['life'] -= 0.1
+            # Keep live explosions in one filtering pass instead of list.remove per expiry;
+            # under the lock, so an explosion appended by the audio thread is never dropped
+            self.explosions[:] = [e for e in self.explosions
+                                  if e['life'] > 0 and e['radius'] <= e['max_radius']]
+    
+    def _pick(self, options):
+        """Pick one entry of a sequence using the shared generator"""
+        return options[self._rng.integers(len(options))]
+    
+    def _band_ranges(self):
+        """Mean low, mid and high band energy in one reduceat"""
+        return np.add.reduceat(self.frequency_bands, self._range_starts) * self._range_scale
     
     def select_ascii_pattern(self):
         """Select ASCII pattern based on audio analysis"""
-        low_energy = np.mean(self.frequency_bands[:2])
-        mid_energy = np.mean(self.frequency_bands[2:6])
-        high_energy = np.mean(self.frequency_bands[6:])
+        low_energy, mid_energy, high_energy = self._band_ranges()
         
         if self.beat and self.energy > 0.05:
-            return random.choice(self.ascii_patterns['beat'])
+            return self._pick(self.ascii_patterns['beat'])
         elif high_energy > mid_energy and high_energy > low_energy:
-            return random.choice(self.ascii_patterns['high'])
+            return self._pick(self.ascii_patterns['high'])
         elif mid_energy > low_energy:
-            return random.choice(self.ascii_patterns['mid'])
+            return self._pick(self.ascii_patterns['mid'])
         else:
-            return random.choice(self.ascii_patterns['low'])
+            return self._pick(self.ascii_patterns['low'])
     
     def select_ai_image(self):
         """Select AI image based on audio analysis"""
-        low_energy = np.mean(self.frequency_bands[:2])
-        high_energy = np.mean(self.frequency_bands[6:])
+        low_energy, _, high_energy = self._band_ranges()
         
         if self.energy > 0.1:
             return self.ai_images['energetic']
@@ -352,8 +455,27 @@ class CombinedMusicVisualizer:
         else:
             return self.ai_images['calm']
     
+    def frames(self):
+        """Frame numbers for FuncAnimation; while the input is silent and no effects
+        are alive, three of every four ticks yield None instead"""
+        frame = 0
+        while True:
+            silent = self.energy < 1e-4 and self.n_particles == 0 and not self.explosions
+            yield None if silent and frame % 4 else frame
+            frame += 1
+    
+    def init_frame(self):
+        """Initial blit frame: hand the persistent artists to FuncAnimation"""
+        return self._artists
+    
     def update_frame(self, frame):
         """Update all visualizations"""
+        if frame is None:
+            # Tick thinned out by frames(): nothing changed, so re-blit what is on
+            # screen. An empty list would make FuncAnimation fall back to a full
+            # draw_idle, which leaves out every animated artist
+            return self._artists
+        
         try:
             with self.lock:
                 audio = self.audio_data.copy()
@@ -361,101 +483,91 @@ class CombinedMusicVisualizer:
                 beat = self.beat
                 bands = self.frequency_bands.copy()
             
-            # Clear all plots
-            self.ax_ascii.clear()
-            self.ax_neural.clear()
-            self.ax_ai.clear()
-            self.ax_wave.clear()
-            self.ax_spectrum.clear()
-            
-            # Setup plots
-            self.setup_plots()
+            # Silent with no live effects: only the waveform can change this frame.
+            # Every artist is still returned, since the blitter restores the background
+            # of each axes it drew last tick and would blank any panel left out
+            if energy < 1e-4 and self.n_particles == 0 and not self.explosions:
+                self._wave_line.set_ydata(audio)
+                self._wave_fill_xy[:self.buffer_size, 1] = audio
+                self._wave_fill.set_verts([self._wave_fill_xy])
+                return self._artists
             
             # Update neural network
             self.update_neural_network()
             self.update_particles()
             
-            # Draw ASCII art
+            # Draw ASCII art: per-column band colors, glyphs reset only when the pattern moves
+            intensity = np.clip(bands[self._ascii_band_idx] * 2, 0, 1)  # Reduced multiplier
+            colors = (self._ascii_color_base + intensity[:, None] * self._ascii_color_slope).tolist()
+            for row in self._ascii_texts:
+                for text, color in zip(row, colors):
+                    text.set_color(color)
+            
             ascii_pattern = self.select_ascii_pattern()
-            rows, cols = 8, 10
-            for row in range(rows):
-                for col in range(cols):
-                    band_idx = col % 8
-                    intensity = clamp(bands[band_idx] * 2)  # Reduced multiplier
-                    
-                    if band_idx < 2:
-                        color = (1, intensity * 0.5, 0)
-                    elif band_idx < 6:
-                        color = (0, 1, intensity * 0.5)
-                    else:
-                        color = (intensity * 0.5, 0.5, 1)
-                    
-                    char_idx = (row + col + frame//10) % len(ascii_pattern)
-                    if char_idx < len(ascii_pattern):
-                        char = ascii_pattern[char_idx]
-                        self.ax_ascii.text(col, rows-row, char,
-                                         color=color, fontsize=20,
-                                         ha='center', va='center',
-                                         weight='bold')
+            shift = frame // 10
+            if (ascii_pattern, shift) != self._ascii_key:
+                self._ascii_key = (ascii_pattern, shift)
+                period = len(ascii_pattern)
+                for row, texts in enumerate(self._ascii_texts):
+                    for col, text in enumerate(texts):
+                        text.set_text(ascii_pattern[(row + col + shift) % period])
             
-            # Draw neural network
-            for i, node1 in enumerate(self.neural_nodes):
-                for j, node2 in enumerate(self.neural_nodes[i+1:], i+1):
-                    if j < i + node1['connections']:
-                        alpha = clamp(self.neural_activation * node1['activation'] * node2['activation'])
-                        if alpha > 0.1:
-                            self.ax_neural.plot([node1['x'], node2['x']],
-                                              [node1['y'], node2['y']],
-                                              color='cyan', alpha=alpha, linewidth=alpha*2)
+            # Draw neural network connections as a single LineCollection
+            alpha = self.neural_activation * self.node_act[self._edge_i] * self.node_act[self._edge_j]
+            shown = alpha > 0.1
+            alpha = np.minimum(alpha[shown], 1.0)
+            colors = np.zeros((len(alpha), 4), dtype=np.float32)
+            colors[:, 1:] = 1
+            colors[:, 3] = alpha
+            self._edge_lc.set_segments(np.stack((self.node_xy[self._edge_i[shown]],
+                                                 self.node_xy[self._edge_j[shown]]), axis=1))
+            self._edge_lc.set_linewidths(alpha * 2)
+            self._edge_lc.set_color(colors)
             
-            for node in self.neural_nodes:
-                size = 50 + node['activation'] * 100  # Reduced multiplier
-                color_intensity = node['activation']
-                self.ax_neural.scatter(node['x'], node['y'], s=size,
-                                     c=[[color_intensity, 1-color_intensity, 1]],
-                                     alpha=0.8, edgecolors='white', linewidth=1)
+            act = self.node_act
+            self._node_pc.set_offsets(self.node_xy)
+            self._node_pc.set_sizes(50 + act * 100)  # Reduced multiplier
+            self._node_pc.set_facecolor(np.column_stack((act, 1 - act, np.ones_like(act))))
             
             # Draw particles and explosions
-            for particle in self.particles:
-                alpha = clamp(particle['life'])
-                size = particle['life'] * 30
-                self.ax_neural.scatter(particle['x'], particle['y'],
-                                     s=size, c=particle['color'], alpha=alpha)
+            n = self.n_particles
+            life = self.particle_life[:n]
+            colors = self.particle_palette[self.particle_color[:n]]
+            colors[:, 3] = life
+            self._particle_pc.set_offsets(self.particle_xy[:n])
+            self._particle_pc.set_sizes(life * 30)
+            self._particle_pc.set_facecolor(colors)
             
-            for explosion in self.explosions:
-                circle = plt.Circle((explosion['x'], explosion['y']),
-                                  explosion['radius'],
-                                  fill=False, color='red',
-                                  alpha=clamp(explosion['life']), linewidth=2)
-                self.ax_neural.add_patch(circle)
+            # Explosions reuse the pooled circles; spare circles stay hidden
+            for k, circle in enumerate(self._explosion_pool):
+                visible = k < len(self.explosions)
+                circle.set_visible(visible)
+                if visible:
+                    explosion = self.explosions[k]
+                    circle.set_center((explosion['x'], explosion['y']))
+                    circle.set_radius(explosion['radius'])
+                    circle.set_alpha(clamp(explosion['life']))
             
             # Draw AI art
-            ai_image = self.select_ai_image()
-            self.ax_ai.imshow(ai_image, aspect='auto')
+            self._ai_im.set_data(self.select_ai_image())
             
             # Draw waveform
-            self.ax_wave.plot(audio, color='cyan', linewidth=1)
-            self.ax_wave.fill_between(range(len(audio)), audio,
-                                    alpha=0.3, color='cyan')
+            self._wave_line.set_ydata(audio)
+            self._wave_fill_xy[:self.buffer_size, 1] = audio
+            self._wave_fill.set_verts([self._wave_fill_xy])
             
-            # Draw spectrum
-            for i, band in enumerate(bands):
-                height = clamp(band * 2)  # Reduced multiplier
-                color = plt.cm.plasma(i / 8)
-                self.ax_spectrum.bar(i, height, width=0.8,
-                                   alpha=0.7, color=color)
+            # Draw spectrum (heights clipped as one array, then pushed to the persistent bars)
+            heights = np.clip(bands * 2, 0, 1)  # Reduced multiplier
+            for bar, height in zip(self._bars, heights.tolist()):
+                bar.set_height(height)
             
             # Add status information
-            self.fig.suptitle('🎼 Combined Music Visualizer', color='white',
-                             fontsize=16, weight='bold', y=0.98)
-            status_text = f'Energy: {energy:.3f} | Beat: {"🔥" if beat else "💤"}'
-            self.fig.text(0.02, 0.98, status_text, color='white',
-                         fontsize=10, transform=self.fig.transFigure)
+            self._status_text.set_text(f'Energy: {energy:.3f} | Beat: {"🔥" if beat else "💤"}')
             
         except Exception as e:
             print(f"[ERROR] Frame update error: {e}")
         
-        return []
+        return self._artists
     
     def start(self):
         """Start the combined visualizer"""
@@ -487,7 +599,9 @@ class CombinedMusicVisualizer:
                 
                 # Start animation
                 ani = animation.FuncAnimation(self.fig, self.update_frame,
-                                           interval=50, blit=False,
+                                           frames=self.frames,
+                                           init_func=self.init_frame,
+                                           interval=50, blit=True,
                                            cache_frame_data=False)
                 plt.tight_layout()
                 plt.show()
@@ -8,28 +8,66 @@ import matplotlib.animation as animation
 import sounddevice as sd
 import threading
 import time
-from collections import deque
-import random
+from matplotlib.colors import to_rgba_array
+from matplotlib.collections import LineCollection
 import math
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+def _neural_step(audio, history, idx, count, last_energy, threshold):
+    """Push the mean-square energy of audio into history[idx] and return
+    (energy, activation, beat), judging the beat against the last 10 energies"""
+    energy = 0.0
+    for k in range(audio.shape[0]):
+        energy += audio[k] * audio[k]
+    energy /= audio.shape[0]
+    history[idx] = energy
+    
+    size = history.shape[0]
+    recent = min(count, 10)
+    acc = 0.0
+    for r in range(recent):
+        acc += history[(idx - r + size) % size]
+    avg_energy = acc / recent
+    
+    activation = max(0.0, (energy - last_energy) * 1000.0)
+    beat = energy > avg_energy * 1.5 and energy > threshold
+    return energy, activation, beat
+
+
+if HAS_NUMBA:
+    # An explicit signature compiles at import (and is cached on disk) and stops
+    # numba from compiling a new specialization inside the audio callback
+    _neural_step = njit('Tuple((f8, f8, b1))(f4[:], f4[:], i8, i8, f8, f8)',
+                        cache=True, fastmath=True)(_neural_step)
+
 
 class ElonMuskAudioBrain:
     def __init__(self):
         self.sample_rate = 44100
         self.buffer_size = 1024
-        self.audio_buffer = deque(maxlen=self.sample_rate * 2)  # 2 seconds
+        # 2 seconds of mono audio as a preallocated ring; _audio_write is the oldest sample
+        self.audio_buffer = np.zeros(self.sample_rate * 2, dtype=np.float32)
+        self._audio_write = 0
+        self._current_audio = np.zeros(self.buffer_size, dtype=np.float32)
         self.lock = threading.Lock()
         
         # Neural network-inspired parameters
         self.energy_threshold = 0.01
-        self.last_energy = 0
-        self.energy_history = deque(maxlen=50)
+        self.last_energy = 0.0
+        self.energy_history = np.zeros(50, dtype=np.float32)  # ring of recent energies
+        self._energy_i = 0
+        self._energy_n = 0
         self.beat_detected = False
         self.neural_activation = 0
         
         # Visual effects
-        self.particles = []
+        self._rng = np.random.default_rng()
+        self.init_particles()
         self.explosions = []
-        self.neural_nodes = []
         self.connection_strength = 0
         
         # Setup visualization
@@ -38,17 +76,40 @@ class ElonMuskAudioBrain:
         self.fig.canvas.manager.set_window_title('🧠 ElonMusk Audio Brain - Neural Audio Reactor')
         
         self.init_neural_network()
+        self.setup_plots()
         
-    def init_neural_network(self):
-        """Initialize neural network visualization nodes"""
-        for i in range(20):
-            x = random.uniform(-1, 1)
-            y = random.uniform(-1, 1)
-            self.neural_nodes.append({
-                'x': x, 'y': y, 
-                'activation': 0,
-                'connections': random.randint(2, 5)
-            })
+    def init_neural_network(self, n_nodes=20):
+        """Initialize neural network visualization nodes as parallel arrays"""
+        self.node_xy = self._rng.uniform(-1, 1, (n_nodes, 2)).astype(np.float32)
+        self.node_act = np.zeros(n_nodes, dtype=np.float32)
+        self.node_conn = self._rng.integers(2, 6, n_nodes).astype(np.int8)
+        
+        # Fixed edges as index arrays: node i links forward to its next (connections - 1) nodes
+        pair_i, pair_j = np.triu_indices(n_nodes, 1)
+        linked = pair_j < pair_i + self.node_conn[pair_i]
+        self._edge_i, self._edge_j = pair_i[linked], pair_j[linked]
+    
+    def init_particles(self, capacity=2048):
+        """Allocate particle storage as parallel arrays (first n_particles rows are live)"""
+        self.particle_xy = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_v = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_life = np.zeros(capacity, dtype=np.float32)
+        self.particle_color = np.zeros(capacity, dtype=np.int8)
+        self.particle_palette = to_rgba_array(['cyan', 'magenta', 'yellow', 'lime']).astype(np.float32)
+        self.n_particles = 0
+    
+    def spawn_particles(self, x, y, angle, speed):
+        """Append a burst of particles starting at (x, y)"""
+        with self.lock:
+            start = self.n_particles
+            count = min(len(angle), len(self.particle_life) - start)
+            end = start + count
+            self.particle_xy[start:end] = (x, y)
+            self.particle_v[start:end, 0] = np.cos(angle[:count]) * speed[:count]
+            self.particle_v[start:end, 1] = np.sin(angle[:count]) * speed[:count]
+            self.particle_life[start:end] = 1.0
+            self.particle_color[start:end] = self._rng.integers(0, len(self.particle_palette), count)
+            self.n_particles = end
     
     def audio_callback(self, indata, frames, time, status):
         """Real-time audio processing with neural analysis"""
@@ -59,25 +120,56 @@ class ElonMuskAudioBrain:
         audio_data = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
         
         with self.lock:
-            self.audio_buffer.extend(audio_data)
+            self._write_ring(audio_data)
             
         # Real-time neural processing
         self.process_neural_audio(audio_data)
     
+    def _write_ring(self, audio_data):
+        """Copy a block of samples into the audio ring buffer, wrapping at the end"""
+        size = len(self.audio_buffer)
+        n = len(audio_data)
+        if n >= size:
+            self.audio_buffer[:] = audio_data[-size:]
+            self._audio_write = 0
+            return
+        
+        end = self._audio_write + n
+        if end <= size:
+            self.audio_buffer[self._audio_write:end] = audio_data
+        else:
+            split = size - self._audio_write
+            self.audio_buffer[self._audio_write:] = audio_data[:split]
+            self.audio_buffer[:n - split] = audio_data[split:]
+        self._audio_write = end % size
+    
     def process_neural_audio(self, audio_chunk):
         """ElonMusk-style neural audio processing"""
-        # Energy calculation
-        energy = np.sum(audio_chunk ** 2) / len(audio_chunk)
-        self.energy_history.append(energy)
+        self._energy_n = min(self._energy_n + 1, len(self.energy_history))
+        if HAS_NUMBA:
+            # Energy, activation and beat fused into one compiled pass
+            energy, activation, beat = _neural_step(audio_chunk, self.energy_history,
+                                                    self._energy_i, self._energy_n,
+                                                    self.last_energy, self.energy_threshold)
+        else:
+            # Energy calculation
+            energy = float(np.dot(audio_chunk, audio_chunk)) / len(audio_chunk)
+            self.energy_history[self._energy_i] = energy
+            activation = max(0, (energy - self.last_energy) * 1000)
+            
+            # Beat threshold from the last 10 ring entries
+            recent = np.take(self.energy_history,
+                             np.arange(self._energy_i - min(self._energy_n, 10) + 1, self._energy_i + 1),
+                             mode='wrap')
+            beat = energy > recent.mean() * 1.5 and energy > self.energy_threshold
+        self._energy_i = (self._energy_i + 1) % len(self.energy_history)
         
         # Neural activation based on energy change
-        if len(self.energy_history) > 1:
-            energy_delta = energy - self.last_energy
-            self.neural_activation = max(0, energy_delta * 1000)
+        if self._energy_n > 1:
+            self.neural_activation = activation
             
             # Beat detection using neural threshold
-            avg_energy = np.mean(list(self.energy_history)[-10:])
-            if energy > avg_energy * 1.5 and energy > self.energy_threshold:
+            if beat:
                 self.trigger_neural_explosion(energy)
                 self.beat_detected = True
             else:
@@ -90,88 +182,125 @@ class ElonMuskAudioBrain:
     
     def trigger_neural_explosion(self, intensity):
         """Create explosive visual effect"""
-        num_particles = int(intensity * 500)
-        center_x = random.uniform(-0.5, 0.5)
-        center_y = random.uniform(-0.5, 0.5)
-        
-        for _ in range(min(num_particles, 50)):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(0.1, 0.5)
-            self.particles.append({
+        num_particles = min(int(intensity * 500), 50)
+        center_x, center_y = self._rng.uniform(-0.5, 0.5, 2)
+        
+        angle = self._rng.uniform(0, 2 * math.pi, num_particles)
+        speed = self._rng.uniform(0.1, 0.5, num_particles)
+        self.spawn_particles(center_x, center_y, angle, speed)
+        
+        # Add explosion effect
+        with self.lock:
+            self.explosions.append({
                 'x': center_x,
                 'y': center_y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': 1.0,
-                'color': random.choice(['cyan', 'magenta', 'yellow', 'lime'])
+                'radius': 0.1,
+                'max_radius': intensity * 2,
+                'life': 1.0
             })
-        
-        # Add explosion effect
-        self.explosions.append({
-            'x': center_x,
-            'y': center_y,
-            'radius': 0.1,
-            'max_radius': intensity * 2,
-            'life': 1.0
-        })
+            # The circle pool bounds how many can be drawn: keep state in step, oldest out
+            if len(self.explosions) > len(self._explosion_pool):
+                del self.explosions[0]
     
     def update_neural_network(self, energy):
         """Update neural network visualization"""
-        for node in self.neural_nodes:
-            # Neural activation based on audio energy
-            node['activation'] = min(1.0, energy * 100 + random.uniform(0, 0.3))
-            
-            # Neural drift for organic movement
-            node['x'] += random.uniform(-0.01, 0.01)
-            node['y'] += random.uniform(-0.01, 0.01)
-            
-            # Keep nodes in bounds
-            node['x'] = max(-1, min(1, node['x']))
-            node['y'] = max(-1, min(1, node['y']))
+        # Neural activation based on audio energy
+        noise = self._rng.uniform(0, 0.3, len(self.node_act))
+        self.node_act[:] = np.minimum(1.0, energy * 100 + noise)
+        
+        # Neural drift for organic movement
+        self.node_xy += self._rng.uniform(-0.01, 0.01, self.node_xy.shape)
+        
+        # Keep nodes in bounds
+        np.clip(self.node_xy, -1, 1, out=self.node_xy)
         
         # Connection strength based on overall energy
         self.connection_strength = min(1.0, energy * 50)
     
     def update_particles(self):
         """Update particle physics"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx'] * 0.02
-            particle['y'] += particle['vy'] * 0.02
-            particle['life'] -= 0.05
+        with self.lock:
+            n = self.n_particles
+            self.particle_xy[:n] += self.particle_v[:n] * 0.02
+            self.particle_life[:n] -= 0.05
             
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-        
-        # Update explosions
-        for explosion in self.explosions[:]:
-            explosion['radius'] += 0.1
-            explosion['life'] -= 0.1
+            # Compact live particles to the front of the arrays
+            alive = self.particle_life[:n] > 0
+            n_alive = int(np.count_nonzero(alive))
+            if n_alive < n:
+                for arr in (self.particle_xy, self.particle_v, self.particle_life, self.particle_color):
+                    arr[:n_alive] = arr[:n][alive]
+                self.n_particles = n_alive
+            
+            # Update explosions
+            for explosion in self.explosions:
+                explosion['radius'] += 0.1
+                explosion['life'] -= 0.1
             
-            if explosion['life'] <= 0 or explosion['radius'] > explosion['max_radius']:
-                self.explosions.remove(explosion)
+            # Keep live explosions in one filtering pass instead of list.remove per expiry;
+            # under the lock, so an explosion appended by the audio thread is never dropped
+            self.explosions[:] = [e for e in self.explosions
+                                  if e['life'] > 0 and e['radius'] <= e['max_radius']]
     
-    def render_frame(self, frame):
-        """Render neural audio visualization"""
-        self.ax.clear()
+    def setup_plots(self):
+        """Create the persistent artists that render_frame updates in place"""
         self.ax.set_xlim(-1.2, 1.2)
         self.ax.set_ylim(-1.2, 1.2)
         self.ax.set_facecolor('black')
+        self.ax.set_title('ELONMUSK AUDIO BRAIN - Neural Reactive System', 
+                         color='white', fontsize=16, weight='bold')
+        self.ax.axis('off')
+        
+        # Neural connections
+        self._edge_lc = LineCollection([])
+        self.ax.add_collection(self._edge_lc)
         
-        # Get current audio data
+        # Nodes and particles, each one PathCollection updated in place
+        self._node_pc = self.ax.scatter(self.node_xy[:, 0], self.node_xy[:, 1], s=50,
+                                        alpha=0.8, edgecolors='white', linewidth=1)
+        self._particle_pc = self.ax.scatter(np.empty(0), np.empty(0))
+        
+        # Explosion rings, reused frame to frame
+        self._explosion_pool = [self.ax.add_patch(plt.Circle((0, 0), 0, fill=False, color='red',
+                                                             linewidth=3, visible=False))
+                                for _ in range(16)]
+        
+        # Audio waveform as neural signal
+        self._wave_t = np.linspace(-1, 1, self.buffer_size, dtype=np.float32)
+        self._wave_line, = self.ax.plot(self._wave_t, np.zeros_like(self._wave_t),
+                                        color='cyan', alpha=0.6, linewidth=1)
+        
+        # Neural status display
+        self._energy_text = self.ax.text(-1.1, 1.0, '', color='lime', fontsize=12, weight='bold')
+        self._activation_text = self.ax.text(-1.1, 0.9, '', color='orange', fontsize=12, weight='bold')
+        self._beat_text = self.ax.text(-1.1, 0.8, '', color='gray', fontsize=12, weight='bold')
+        
+        # Blit order matches the original draw order
+        self._artists = [self._edge_lc, self._node_pc, self._wave_line, self._particle_pc,
+                         *self._explosion_pool,
+                         self._energy_text, self._activation_text, self._beat_text]
+    
+    def init_frame(self):
+        """Hand the persistent artists to the blitter before the first frame"""
+        return self._artists
+    
+    def render_frame(self, frame):
+        """Render neural audio visualization"""
+        # Get current audio data (the newest buffer_size samples of the ring)
+        current_audio = self._current_audio
         with self.lock:
-            if len(self.audio_buffer) > 0:
-                current_audio = np.array(list(self.audio_buffer)[-1024:])
+            start = self._audio_write - self.buffer_size
+            if start >= 0:
+                current_audio[:] = self.audio_buffer[start:self._audio_write]
             else:
-                current_audio = np.zeros(1024)
+                current_audio[:-start] = self.audio_buffer[start:]
+                current_audio[-start:] = self.audio_buffer[:self._audio_write]
         
         # Neural network visualization
         self.render_neural_network()
         
         # Audio waveform as neural signal
-        if len(current_audio) > 0:
-            t = np.linspace(-1, 1, len(current_audio))
-            waveform = current_audio * 0.3
-            self.ax.plot(t, waveform, color='cyan', alpha=0.6, linewidth=1)
+        self._wave_line.set_ydata(current_audio * 0.3)
         
         # Render particles and explosions
         self.render_effects()
@@ -181,53 +310,53 @@ class ElonMuskAudioBrain:
         
         # Neural status display
         energy = self.last_energy
-        self.ax.text(-1.1, 1.0, f'BRAIN Energy: {energy:.4f}', 
-                    color='lime', fontsize=12, weight='bold')
-        self.ax.text(-1.1, 0.9, f'FIRE Activation: {self.neural_activation:.2f}', 
-                    color='orange', fontsize=12, weight='bold')
-        self.ax.text(-1.1, 0.8, f'BEAT: {"DETECTED" if self.beat_detected else "---"}', 
-                    color='red' if self.beat_detected else 'gray', fontsize=12, weight='bold')
+        self._energy_text.set_text(f'BRAIN Energy: {energy:.4f}')
+        self._activation_text.set_text(f'FIRE Activation: {self.neural_activation:.2f}')
+        self._beat_text.set_text(f'BEAT: {"DETECTED" if self.beat_detected else "---"}')
+        self._beat_text.set_color('red' if self.beat_detected else 'gray')
         
-        self.ax.set_title('ELONMUSK AUDIO BRAIN - Neural Reactive System', 
-                         color='white', fontsize=16, weight='bold')
-        self.ax.axis('off')
+        return self._artists
     
     def render_neural_network(self):
         """Render neural network nodes and connections"""
-        # Draw connections
-        for i, node1 in enumerate(self.neural_nodes):
-            for j, node2 in enumerate(self.neural_nodes[i+1:], i+1):
-                if j < i + node1['connections']:
-                    alpha = self.connection_strength * node1['activation'] * node2['activation']
-                    if alpha > 0.1:
-                        self.ax.plot([node1['x'], node2['x']], [node1['y'], node2['y']], 
-                                   color='cyan', alpha=alpha, linewidth=alpha*3)
+        # Draw connections as a single LineCollection
+        alpha = self.connection_strength * self.node_act[self._edge_i] * self.node_act[self._edge_j]
+        shown = alpha > 0.1
+        alpha = alpha[shown]
+        colors = np.zeros((len(alpha), 4), dtype=np.float32)
+        colors[:, 1:] = 1
+        colors[:, 3] = alpha
+        self._edge_lc.set_segments(np.stack((self.node_xy[self._edge_i[shown]],
+                                             self.node_xy[self._edge_j[shown]]), axis=1))
+        self._edge_lc.set_linewidths(alpha * 3)
+        self._edge_lc.set_color(colors)
         
         # Draw nodes
-        for node in self.neural_nodes:
-            size = 50 + node['activation'] * 200
-            color_intensity = node['activation']
-            self.ax.scatter(node['x'], node['y'], s=size, 
-                          c=[[color_intensity, 1-color_intensity, 1]], 
-                          alpha=0.8, edgecolors='white', linewidth=1)
+        act = self.node_act
+        self._node_pc.set_offsets(self.node_xy)
+        self._node_pc.set_sizes(50 + act * 200)
+        self._node_pc.set_facecolor(np.column_stack((act, 1 - act, np.ones_like(act))))
     
     def render_effects(self):
         """Render particles and explosions"""
         # Render particles
-        for particle in self.particles:
-            alpha = particle['life']
-            size = particle['life'] * 30
-            self.ax.scatter(particle['x'], particle['y'], s=size, 
-                          c=particle['color'], alpha=alpha)
-        
-        # Render explosions
-        for explosion in self.explosions:
-            alpha = explosion['life']
-            circle = plt.Circle((explosion['x'], explosion['y']), 
-                              explosion['radius'], 
-                              fill=False, color='red', 
-                              alpha=alpha, linewidth=3)
-            self.ax.add_patch(circle)
+        n = self.n_particles
+        life = self.particle_life[:n]
+        colors = self.particle_palette[self.particle_color[:n]]
+        colors[:, 3] = life
+        self._particle_pc.set_offsets(self.particle_xy[:n])
+        self._particle_pc.set_sizes(life * 30)
+        self._particle_pc.set_facecolor(colors)
+        
+        # Render explosions with the pooled circles; spare circles stay hidden
+        for k, circle in enumerate(self._explosion_pool):
+            visible = k < len(self.explosions)
+            circle.set_visible(visible)
+            if visible:
+                explosion = self.explosions[k]
+                circle.set_center((explosion['x'], explosion['y']))
+                circle.set_radius(explosion['radius'])
+                circle.set_alpha(explosion['life'])
     
     def start_neural_processing(self):
         """Start the neural audio processing system"""
@@ -262,7 +391,9 @@ class ElonMuskAudioBrain:
                 
                 # Start visualization
                 ani = animation.FuncAnimation(self.fig, self.render_frame, 
-                                            interval=50, blit=False)
+                                            init_func=self.init_frame,
+                                            interval=50, blit=True,
+                                            cache_frame_data=False)
                 plt.tight_layout()
                 plt.show()
                 
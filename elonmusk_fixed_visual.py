@@ -5,26 +5,94 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import sounddevice as sd
+import scipy.fft
 import threading
-import random
 import math
-from collections import deque
+from matplotlib.colors import to_rgba_array
+from matplotlib.collections import LineCollection
+from audio_kernels import process_audio, band_means
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# ASCII cell characters from quietest to loudest, and the intensities separating them
+_ASCII_RAMP = np.frombuffer(b' .+*#', dtype=np.uint8)
+_ASCII_LEVELS = np.array([0.1, 0.2, 0.4, 0.7])
+
+def _build_grid(bands, grid):
+    """Fill grid with the character code for each column's band intensity"""
+    for row in range(grid.shape[0]):
+        for col in range(grid.shape[1]):
+            intensity = min(1.0, bands[col % 8] * 500.0)
+            level = 0
+            while level < len(_ASCII_LEVELS) and intensity > _ASCII_LEVELS[level]:
+                level += 1
+            grid[row, col] = _ASCII_RAMP[level]
+    return grid
+
+
+def _step_particles(xy, v, life, color, n):
+    """Advance the first n particles one frame, compact the survivors to the
+    front of the arrays and return how many are left"""
+    alive = 0
+    for k in range(n):
+        life[k] -= 1
+        if life[k] > 0:
+            xy[alive, 0] = xy[k, 0] + v[k, 0]
+            xy[alive, 1] = xy[k, 1] + v[k, 1]
+            v[alive, 0] = v[k, 0]
+            v[alive, 1] = v[k, 1]
+            life[alive] = life[k]
+            color[alive] = color[k]
+            alive += 1
+    return alive
+
+
+if HAS_NUMBA:
+    _build_grid = njit(cache=True)(_build_grid)
+    _step_particles = njit(cache=True)(_step_particles)
+
 
 class ElonMuskFixedVisual:
     def __init__(self):
         self.sample_rate = 22050
         self.buffer_size = 512
-        self.audio_buffer = deque(maxlen=2048)
+        # Last 2048 mono samples as a preallocated ring; _audio_write is the oldest sample
+        self.audio_buffer = np.zeros(2048, dtype=np.float32)
+        self._audio_write = 0
+        self._current_audio = np.zeros(1024, dtype=np.float32)
+        self._mono = np.zeros(self.buffer_size, dtype=np.float32)
+        self._wave_t = np.linspace(-1, 1, len(self._current_audio), dtype=np.float32)
         self.lock = threading.Lock()
         
         # Audio analysis
         self.energy = 0
         self.beat = False
-        self.frequency_bands = np.zeros(8)
+        self.frequency_bands = np.zeros(8, dtype=np.float32)
+        self._bar_colors = plt.cm.plasma(np.arange(8) / 8)
+        
+        # ASCII cell colour = base + slope * intensity: low bands red, mid green, high blue
+        band_idx = np.arange(8)
+        low, high = band_idx < 2, band_idx >= 6
+        mid = ~low & ~high
+        self._ascii_color_base = np.zeros((8, 3), dtype=np.float32)
+        self._ascii_color_slope = np.zeros((8, 3), dtype=np.float32)
+        self._ascii_color_base[low] = (1, 0, 0)
+        self._ascii_color_slope[low] = (0, 0.5, 0)
+        self._ascii_color_base[mid] = (0, 1, 0)
+        self._ascii_color_slope[mid] = (0, 0, 0.5)
+        self._ascii_color_base[high] = (0, 0.5, 1)
+        self._ascii_color_slope[high] = (0.5, 0, 0)
+        self._band_size = (256 // 2 + 1) // 8  # rfft bins per band
+        self._mag = np.empty(256 // 2 + 1, dtype=np.float32)  # reused FFT magnitude
+        self._bands = np.zeros(8, dtype=np.float32)
         
         # Visual effects
-        self.particles = []
-        self.neural_nodes = []
+        self._rng = np.random.default_rng()
+        self.init_particles()
+        self._ascii_grid = np.empty((8, 8), dtype=np.uint8)
         
         # Setup visualization
         plt.style.use('dark_background')
@@ -36,199 +104,231 @@ class ElonMuskFixedVisual:
         self.ax_visual = self.fig.add_subplot(gs[:, 2])  # Right visual panel
         
         self.init_neural_network()
+        self.setup_plots()
+        
+        if HAS_NUMBA:
+            # Compile the kernels now rather than on the first frame
+            _build_grid(self.frequency_bands, self._ascii_grid)
+            _step_particles(self.particle_xy, self.particle_v, self.particle_life,
+                            self.particle_color, 0)
+        
+    def init_neural_network(self, n_nodes=15):
+        """Initialize neural nodes as parallel arrays"""
+        self.node_xy = self._rng.uniform(-1, 1, (n_nodes, 2)).astype(np.float32)
+        self.node_activation = np.zeros(n_nodes, dtype=np.float32)
+        self.node_size = self._rng.uniform(20, 60, n_nodes).astype(np.float32)
+        
+        # Fixed edges as index arrays: node i links to nodes i+1 and i+2
+        pair_i, pair_j = np.triu_indices(n_nodes, 1)
+        linked = pair_j < pair_i + 3
+        self._edge_i, self._edge_j = pair_i[linked], pair_j[linked]
+    
+    def init_particles(self, capacity=20):
+        """Allocate particle storage as parallel arrays (first n_particles rows are live)"""
+        self.particle_xy = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_v = np.zeros((capacity, 2), dtype=np.float32)
+        self.particle_life = np.zeros(capacity, dtype=np.float32)
+        self.particle_color = np.zeros(capacity, dtype=np.int8)
+        self.particle_palette = to_rgba_array(['cyan', 'magenta', 'yellow', 'lime'])
+        self.n_particles = 0
+    
+    def setup_plots(self):
+        """Create the persistent artists that update_frame updates in place"""
+        # Main plot
+        self.ax_main.set_xlim(-1.2, 1.2)
+        self.ax_main.set_ylim(-1.2, 1.2)
+        self.ax_main.set_facecolor('black')
+        self.ax_main.axis('off')
+        self.ax_main.set_title('ELONMUSK NEURAL BRAIN', color='white', fontsize=16, weight='bold')
+        
+        # Neural connections
+        self._edge_lc = LineCollection([], linewidths=1)
+        self.ax_main.add_collection(self._edge_lc)
+        
+        # Nodes, waveform and particles
+        self._node_pc = self.ax_main.scatter(self.node_xy[:, 0], self.node_xy[:, 1], s=self.node_size,
+                                             alpha=0.8, edgecolors='white', linewidth=1)
+        self._wave_line, = self.ax_main.plot(self._wave_t, np.zeros_like(self._wave_t),
+                                             color='cyan', alpha=0.6, linewidth=1)
+        self._particle_pc = self.ax_main.scatter(np.empty(0), np.empty(0), s=30)
+        
+        # Status display
+        self._energy_text = self.ax_main.text(-1.1, 1.0, '', color='lime', fontsize=12, weight='bold')
+        self._beat_text = self.ax_main.text(-1.1, 0.9, '', color='gray', fontsize=12, weight='bold')
+        
+        # RIGHT PANEL - ASCII ART VISUALIZATION
+        # One persistent Text per cell, in data coordinates so it follows resizes;
+        # frames only change the glyphs that differ and recolour the columns
+        self._ascii_texts = [[self.ax_visual.text(col, 7 - row, ' ', fontsize=16,
+                                                  ha='center', va='center',
+                                                  weight='bold', family='monospace')
+                              for col in range(8)] for row in range(8)]
+        self._ascii_shown = np.full((8, 8), ord(' '), dtype=np.uint8)
+        
+        self.ax_visual.set_xlim(0, 8)
+        self.ax_visual.set_ylim(0, 8)
+        self.ax_visual.set_facecolor('black')
+        self.ax_visual.axis('off')
+        self.ax_visual.set_title('ASCII ART', color='yellow', fontsize=14, weight='bold')
+        
+        # Frequency bars in visual panel
+        self._bars = self.ax_visual.bar(range(8), np.zeros(8), 0.8, bottom=0, alpha=0.3,
+                                        color=self._bar_colors)
         
-    def init_neural_network(self):
-        """Initialize neural nodes"""
-        for i in range(15):
-            self.neural_nodes.append({
-                'x': random.uniform(-1, 1),
-                'y': random.uniform(-1, 1),
-                'activation': 0,
-                'size': random.uniform(20, 60)
-            })
+        self._artists = [self._edge_lc, self._node_pc, self._wave_line,
+                         self._particle_pc, self._energy_text, self._beat_text,
+                         *self._bars, *(text for row in self._ascii_texts for text in row)]
+    
+    def init_frame(self):
+        """Hand every persistent artist to the blitter before the first frame"""
+        return self._artists
     
     def audio_callback(self, indata, frames, time, status):
         """Process audio"""
-        mono = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
+        mono = np.mean(indata, axis=1, out=self._mono[:len(indata)]) if indata.shape[1] > 1 else indata[:, 0]
         
         # Energy and beat detection
-        energy = np.mean(mono ** 2)
-        beat = energy > 0.02
+        energy, beat = process_audio(mono, 0.02)
         
         # Frequency analysis
+        bands = self._bands
         if len(mono) >= 256:
-            fft = np.fft.rfft(mono[:256])
-            magnitude = np.abs(fft)
-            bands = np.zeros(8)
-            band_size = len(magnitude) // 8
-            for i in range(8):
-                start = i * band_size
-                end = (i + 1) * band_size
-                bands[i] = np.mean(magnitude[start:end])
+            fft = scipy.fft.rfft(mono[:256], workers=1)
+            magnitude = np.abs(fft, out=self._mag)
+            band_means(magnitude, self._band_size, bands)
         else:
-            bands = np.zeros(8)
+            bands[:] = 0
         
         with self.lock:
-            self.audio_buffer.extend(mono)
+            self._write_ring(mono)
             self.energy = energy
             self.beat = beat
-            self.frequency_bands = bands
+            self.frequency_bands[:] = bands
             
             # Add particles on beat
-            if beat and energy > 0.05 and len(self.particles) < 20:
-                self.particles.append({
-                    'x': random.uniform(-0.8, 0.8),
-                    'y': random.uniform(-0.8, 0.8),
-                    'vx': random.uniform(-0.1, 0.1),
-                    'vy': random.uniform(-0.1, 0.1),
-                    'life': 30,
-                    'color': random.choice(['cyan', 'magenta', 'yellow', 'lime'])
-                })
+            k = self.n_particles
+            if beat and energy > 0.05 and k < len(self.particle_life):
+                self.particle_xy[k] = self._rng.uniform(-0.8, 0.8, 2)
+                self.particle_v[k] = self._rng.uniform(-0.1, 0.1, 2)
+                self.particle_life[k] = 30
+                self.particle_color[k] = self._rng.integers(len(self.particle_palette))
+                self.n_particles = k + 1
+    
+    def _write_ring(self, audio_data):
+        """Copy a block of samples into the audio ring buffer, wrapping at the end"""
+        size = len(self.audio_buffer)
+        n = len(audio_data)
+        if n >= size:
+            self.audio_buffer[:] = audio_data[-size:]
+            self._audio_write = 0
+            return
+        
+        end = self._audio_write + n
+        if end <= size:
+            self.audio_buffer[self._audio_write:end] = audio_data
+        else:
+            split = size - self._audio_write
+            self.audio_buffer[self._audio_write:] = audio_data[:split]
+            self.audio_buffer[:n - split] = audio_data[split:]
+        self._audio_write = end % size
     
     def draw_ascii_art(self):
         """Generate ASCII art based on frequency bands"""
-        patterns = []
-        
-        # Different patterns for different frequency ranges
-        low_pattern = ["###", "===", "---", "..."]
-        mid_pattern = ["^^^", "~~~", "***", "+++"]
-        high_pattern = ["!!!", "|||", "^^^", ":::"]
-        
-        # Select pattern based on dominant frequency
-        low_energy = np.mean(self.frequency_bands[:2])
-        mid_energy = np.mean(self.frequency_bands[2:6])
-        high_energy = np.mean(self.frequency_bands[6:])
-        
-        if high_energy > mid_energy and high_energy > low_energy:
-            base_pattern = high_pattern
-        elif mid_energy > low_energy:
-            base_pattern = mid_pattern
-        else:
-            base_pattern = low_pattern
-        
-        # Create 8x8 grid
-        grid = []
-        for row in range(8):
-            line = ""
-            for col in range(8):
-                band_idx = col % 8
-                intensity = min(1.0, self.frequency_bands[band_idx] * 500)
-                
-                if intensity > 0.7:
-                    char = "#"
-                elif intensity > 0.4:
-                    char = "*"
-                elif intensity > 0.2:
-                    char = "+"
-                elif intensity > 0.1:
-                    char = "."
-                else:
-                    char = " "
-                
-                line += char
-            grid.append(line)
+        # Create 8x8 grid of character codes
+        if HAS_NUMBA:
+            return _build_grid(self.frequency_bands, self._ascii_grid)
         
-        return grid
+        intensity = np.minimum(1.0, self.frequency_bands[np.arange(8) % 8] * 500)
+        self._ascii_grid[:] = _ASCII_RAMP[np.searchsorted(_ASCII_LEVELS, intensity)]
+        return self._ascii_grid
     
     def update_frame(self, frame):
         """Update visualization"""
+        # Newest 1024 samples of the ring, copied in at most two slices
+        audio_data = self._current_audio
         with self.lock:
-            audio_data = list(self.audio_buffer)[-1024:] if self.audio_buffer else np.zeros(1024)
+            start = self._audio_write - len(audio_data)
+            if start >= 0:
+                audio_data[:] = self.audio_buffer[start:self._audio_write]
+            else:
+                audio_data[:-start] = self.audio_buffer[start:]
+                audio_data[-start:] = self.audio_buffer[:self._audio_write]
             energy = self.energy
             beat = self.beat
             bands = self.frequency_bands.copy()
         
-        # Clear plots
-        self.ax_main.clear()
-        self.ax_visual.clear()
+        # Update neural network
+        act = self.node_activation
+        np.minimum(1.0, energy * 100 + self._rng.uniform(0, 0.2, len(act)), out=act)
         
-        # Setup main plot
-        self.ax_main.set_xlim(-1.2, 1.2)
-        self.ax_main.set_ylim(-1.2, 1.2)
-        self.ax_main.set_facecolor('black')
-        self.ax_main.axis('off')
-        self.ax_main.set_title('ELONMUSK NEURAL BRAIN', color='white', fontsize=16, weight='bold')
+        # Connections, drawn as a single LineCollection
+        alpha = act[self._edge_i] * act[self._edge_j] * 0.5
+        shown = alpha > 0.1
+        colors = np.zeros((np.count_nonzero(shown), 4), dtype=np.float32)
+        colors[:, 1:3] = 1
+        colors[:, 3] = alpha[shown]
+        self._edge_lc.set_segments(np.stack((self.node_xy[self._edge_i[shown]],
+                                             self.node_xy[self._edge_j[shown]]), axis=1))
+        self._edge_lc.set_color(colors)
         
-        # Draw neural network
-        for i, node in enumerate(self.neural_nodes):
-            # Update node activation
-            node['activation'] = min(1.0, energy * 100 + random.uniform(0, 0.2))
-            
-            # Draw connections
-            for j, other_node in enumerate(self.neural_nodes[i+1:], i+1):
-                if j < i + 3:  # Limit connections
-                    alpha = node['activation'] * other_node['activation'] * 0.5
-                    if alpha > 0.1:
-                        self.ax_main.plot([node['x'], other_node['x']], 
-                                        [node['y'], other_node['y']], 
-                                        color='cyan', alpha=alpha, linewidth=1)
-            
-            # Draw node
-            size = node['size'] + node['activation'] * 100
-            color_intensity = node['activation']
-            self.ax_main.scatter(node['x'], node['y'], s=size,
-                               c=[[color_intensity, 1-color_intensity, 1]], 
-                               alpha=0.8, edgecolors='white', linewidth=1)
-        
-        # Draw waveform
-        if len(audio_data) > 0:
-            audio_array = np.array(audio_data)
-            t = np.linspace(-1, 1, len(audio_array))
-            self.ax_main.plot(t, audio_array * 0.3, color='cyan', alpha=0.6, linewidth=1)
-        
-        # Draw particles
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                alpha = particle['life'] / 30
-                self.ax_main.scatter(particle['x'], particle['y'], 
-                                   s=30, c=particle['color'], alpha=alpha)
+        # Nodes
+        self._node_pc.set_sizes(self.node_size + act * 100)
+        self._node_pc.set_facecolor(np.column_stack((act, 1 - act, np.ones_like(act))))
         
-        # Status display
-        self.ax_main.text(-1.1, 1.0, f'Energy: {energy:.4f}', color='lime', fontsize=12, weight='bold')
-        self.ax_main.text(-1.1, 0.9, f'Beat: {"DETECTED" if beat else "---"}', 
-                         color='red' if beat else 'gray', fontsize=12, weight='bold')
+        # Waveform
+        self._wave_line.set_ydata(audio_data * 0.3)
         
-        # RIGHT PANEL - ASCII ART VISUALIZATION
-        self.ax_visual.set_xlim(0, 8)
-        self.ax_visual.set_ylim(0, 8)
-        self.ax_visual.set_facecolor('black')
-        self.ax_visual.axis('off')
-        self.ax_visual.set_title('ASCII ART', color='yellow', fontsize=14, weight='bold')
+        # Particles
+        with self.lock:
+            self.update_particles()
+            n = self.n_particles
+            colors = self.particle_palette[self.particle_color[:n]]
+            colors[:, 3] = self.particle_life[:n] / 30
+            self._particle_pc.set_offsets(self.particle_xy[:n])
+        self._particle_pc.set_facecolor(colors)
+        
+        # Status display
+        self._energy_text.set_text(f'Energy: {energy:.4f}')
+        self._beat_text.set_text(f'Beat: {"DETECTED" if beat else "---"}')
+        self._beat_text.set_color('red' if beat else 'gray')
         
         # Generate and display ASCII art
         ascii_grid = self.draw_ascii_art()
         
-        for row, line in enumerate(ascii_grid):
-            for col, char in enumerate(line):
-                # Color based on frequency band
-                band_idx = col % 8
-                intensity = min(1.0, bands[band_idx] * 500)
-                
-                if band_idx < 2:  # Low freq - red
-                    color = (1, intensity * 0.5, 0)
-                elif band_idx < 6:  # Mid freq - green  
-                    color = (0, 1, intensity * 0.5)
-                else:  # High freq - blue
-                    color = (intensity * 0.5, 0.5, 1)
-                
-                self.ax_visual.text(col, 7-row, char, color=color, 
-                                  fontsize=16, ha='center', va='center', 
-                                  weight='bold', family='monospace')
+        for row, col in zip(*np.nonzero(ascii_grid != self._ascii_shown)):
+            self._ascii_texts[row][col].set_text(chr(ascii_grid[row, col]))
+        self._ascii_shown[:] = ascii_grid
+        
+        # Color based on frequency band, constant down each column
+        intensity = np.minimum(1.0, bands * 500)
+        colors = (self._ascii_color_base + self._ascii_color_slope * intensity[:, None]).tolist()
+        for row in self._ascii_texts:
+            for text, color in zip(row, colors):
+                text.set_color(color)
         
         # Frequency bars in visual panel
-        for i, band in enumerate(bands):
+        for bar, band in zip(self._bars, bands):
             height = min(7, band * 1000)
-            if height > 0.1:
-                self.ax_visual.bar(i, height, 0.8, bottom=0, 
-                                 alpha=0.3, color=plt.cm.plasma(i/8))
+            bar.set_height(height if height > 0.1 else 0)
+        
+        return self._artists
+    
+    def update_particles(self):
+        """Move live particles and drop expired ones (caller holds the lock)"""
+        n = self.n_particles
+        if HAS_NUMBA:
+            self.n_particles = _step_particles(self.particle_xy, self.particle_v, self.particle_life,
+                                               self.particle_color, n)
+            return
         
-        return []
+        self.particle_life[:n] -= 1
+        alive = self.particle_life[:n] > 0
+        self.particle_xy[:n] += self.particle_v[:n]
+        n_alive = int(np.count_nonzero(alive))
+        if n_alive < n:
+            for arr in (self.particle_xy, self.particle_v, self.particle_life, self.particle_color):
+                arr[:n_alive] = arr[:n][alive]
+        self.n_particles = n_alive
     
     def start(self):
         """Start the visualizer"""
@@ -255,8 +355,9 @@ class ElonMuskFixedVisual:
                               dtype=np.float32):
                 
                 # Start animation
-                self.ani = animation.FuncAnimation(self.fig, self.update_frame, 
-                                                 interval=100, blit=False, cache_frame_data=False)
+                self.ani = animation.FuncAnimation(self.fig, self.update_frame,
+                                                 init_func=self.init_frame,
+                                                 interval=100, blit=True, cache_frame_data=False)
                 
                 plt.tight_layout()
                 plt.show(block=True)
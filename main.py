@@ -26,9 +26,10 @@ class AudioAnalyzer:
         self.audio_engine = AudioEngine(sample_rate, buffer_size)
         self.visualizer = AudioVisualizer(sample_rate)
         
-        # Optional recording
+        # Optional recording into a growable float32 buffer; _rec_head is the sample count
         self.recording = False
-        self.recorded_data = []
+        self.recorded_data = np.empty(0, dtype=np.float32)
+        self._rec_head = 0
         
     def list_devices(self):
         """List available audio devices"""
@@ -51,7 +52,8 @@ class AudioAnalyzer:
         # Setup recording if requested
         if save_audio:
             self.recording = True
-            self.recorded_data = []
+            self.recorded_data = np.empty(self.sample_rate * 60, dtype=np.float32)
+            self._rec_head = 0
             print("Audio recording enabled - will save to 'recorded_audio.wav'")
         
         # Start audio capture
@@ -61,13 +63,13 @@ class AudioAnalyzer:
         
         # Setup data flow: audio_engine -> visualizer
         def data_callback(audio_chunk):
-            # Update visualizer
-            current_data = self.audio_engine.get_audio_data()
-            self.visualizer.update_data(current_data)
+            # Feed only the new samples; the visualizer's ring accumulates the
+            # chunks and each animation frame analyses the newest window
+            self.visualizer.update_data(audio_chunk)
             
             # Record if enabled
             if self.recording:
-                self.recorded_data.extend(audio_chunk)
+                self._record(audio_chunk)
         
         self.audio_engine.set_data_callback(data_callback)
         
@@ -81,15 +83,26 @@ class AudioAnalyzer:
         
         return True
     
+    def _record(self, audio_chunk):
+        """Append a chunk to the recording, doubling the buffer when it fills"""
+        n = len(audio_chunk)
+        end = self._rec_head + n
+        if end > len(self.recorded_data):
+            grown = np.empty(max(end, 2 * len(self.recorded_data)), dtype=np.float32)
+            grown[:self._rec_head] = self.recorded_data[:self._rec_head]
+            self.recorded_data = grown
+        self.recorded_data[self._rec_head:end] = audio_chunk
+        self._rec_head = end
+    
     def cleanup(self, save_audio=False):
         """Clean shutdown"""
         self.audio_engine.stop_capture()
         self.visualizer.stop_visualization()
         
         # Save recorded audio if enabled
-        if save_audio and self.recorded_data and HAS_SOUNDFILE:
+        if save_audio and self._rec_head and HAS_SOUNDFILE:
             try:
-                audio_array = np.array(self.recorded_data, dtype=np.float32)
+                audio_array = self.recorded_data[:self._rec_head]
                 sf.write('recorded_audio.wav', audio_array, self.sample_rate)
                 print(f"Saved {len(audio_array)/self.sample_rate:.1f}s of audio to 'recorded_audio.wav'")
             except Exception as e:
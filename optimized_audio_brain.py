@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import sounddevice as sd
 import threading
+from audio_kernels import process_audio
 from collections import deque
 import time
 
@@ -14,17 +15,20 @@ class OptimizedAudioBrain:
     def __init__(self):
         self.sample_rate = 22050  # Reduced for performance
         self.buffer_size = 512    # Smaller buffer
-        self.audio_data = np.zeros(1024)
+        self.audio_data = np.zeros(1024, dtype=np.float32)
+        self._frame_audio = np.zeros_like(self.audio_data)  # update_frame's private copy
+        self._mono = np.zeros(self.buffer_size, dtype=np.float32)
         self.lock = threading.Lock()
         
         # Minimal state tracking
         self.energy = 0
         self.beat = False
-        self.frame_count = 0
         
-        # Ultra-light particle system
-        self.particles = []
+        # Ultra-light particle system as parallel arrays (first n_particles rows are live)
         self.max_particles = 10  # Drastically reduced
+        self.particle_xy = np.zeros((self.max_particles, 2), dtype=np.float32)
+        self.particle_life = np.zeros(self.max_particles, dtype=np.int16)
+        self.n_particles = 0
         
         # Setup minimal plot
         plt.ion()
@@ -35,97 +39,84 @@ class OptimizedAudioBrain:
         self.ax.set_ylim(-1, 1)
         self.ax.axis('off')
         
-        # Pre-allocate plot elements
-        self.waveform_line, = self.ax.plot([], [], 'cyan', linewidth=1)
+        # Pre-allocate plot elements; the waveform shows 1024 samples averaged in blocks of 4
+        self._wave_decimation = 4
+        self._wave_t = np.linspace(-1, 1, len(self.audio_data) // self._wave_decimation, dtype=np.float32)
+        self.waveform_line, = self.ax.plot(self._wave_t, np.zeros_like(self._wave_t), 'cyan', linewidth=1)
         self.energy_circle = plt.Circle((0, 0), 0.1, fill=False, color='red', linewidth=2)
         self.ax.add_patch(self.energy_circle)
+        self.particles_scatter = self.ax.scatter(np.empty(0), np.empty(0), c='yellow', s=20, alpha=0.8)
+        self.energy_text = self.ax.text(-0.9, 0.9, '', color='lime', fontsize=10)
+        self.beat_text = self.ax.text(-0.9, 0.8, '', color='gray', fontsize=10)
+        self._artists = [self.waveform_line, self.energy_circle, self.particles_scatter,
+                         self.energy_text, self.beat_text]
+        
+    def init_frame(self):
+        """Hand the preallocated artists to the blitter before the first frame"""
+        return self._artists
         
     def audio_callback(self, indata, frames, time, status):
         """Ultra-fast audio processing"""
         # Convert to mono immediately
-        mono = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
-        
-        # Quick energy calculation
-        energy = np.mean(mono ** 2)
+        mono = np.mean(indata, axis=1, out=self._mono[:len(indata)]) if indata.shape[1] > 1 else indata[:, 0]
         
-        # Simple beat detection
-        beat = energy > 0.01
+        # Quick energy calculation and simple beat detection
+        energy, beat = process_audio(mono, 0.01)
         
         # Thread-safe update
         with self.lock:
-            self.audio_data = mono[-1024:] if len(mono) >= 1024 else np.pad(mono, (0, 1024-len(mono)))
+            # Newest samples in place, zero-padded at the end
+            n = min(len(mono), len(self.audio_data))
+            self.audio_data[:n] = mono[-n:]
+            self.audio_data[n:] = 0
             self.energy = energy
             self.beat = beat
             
             # Add particle only on strong beats
-            if beat and energy > 0.05 and len(self.particles) < self.max_particles:
-                self.particles.append({
-                    'x': np.random.uniform(-0.5, 0.5),
-                    'y': np.random.uniform(-0.5, 0.5),
-                    'life': 30  # frames
-                })
+            k = self.n_particles
+            if beat and energy > 0.05 and k < self.max_particles:
+                self.particle_xy[k] = np.random.uniform(-0.5, 0.5, 2)
+                self.particle_life[k] = 30  # frames
+                self.n_particles = k + 1
     
     def update_frame(self, frame):
         """Minimal rendering update"""
-        self.frame_count += 1
-        
-        # Skip frames for performance
-        if self.frame_count % 2 != 0:
-            return []
-        
         with self.lock:
-            audio = self.audio_data.copy()
+            audio = self._frame_audio
+            audio[:] = self.audio_data
             energy = self.energy
             beat = self.beat
         
-        # Update waveform (downsampled)
-        if len(audio) > 0:
-            # Use every 4th sample for performance
-            downsampled = audio[::4]
-            t = np.linspace(-1, 1, len(downsampled))
-            self.waveform_line.set_data(t, downsampled * 0.5)
+        # Update waveform (block-mean downsampled, which also smooths out aliasing)
+        display = audio.reshape(-1, self._wave_decimation).mean(axis=1)
+        display *= 0.5
+        self.waveform_line.set_ydata(display)
         
         # Update energy circle
         radius = min(0.8, energy * 20)
         self.energy_circle.set_radius(radius)
-        self.energy_circle.set_color('red' if beat else 'blue')
-        
-        # Ultra-simple particle update
-        for particle in self.particles[:]:
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-        
-        # Draw particles as simple dots
-        self.ax.clear()
-        self.ax.set_xlim(-1, 1)
-        self.ax.set_ylim(-1, 1)
-        self.ax.set_facecolor('black')
-        self.ax.axis('off')
-        
-        # Redraw waveform
-        if len(audio) > 0:
-            downsampled = audio[::4]
-            t = np.linspace(-1, 1, len(downsampled))
-            self.ax.plot(t, downsampled * 0.5, 'cyan', linewidth=1)
+        self.energy_circle.set_edgecolor('red' if beat else 'blue')
         
-        # Draw energy circle
-        circle = plt.Circle((0, 0), radius, fill=False, 
-                           color='red' if beat else 'blue', linewidth=2)
-        self.ax.add_patch(circle)
-        
-        # Draw particles
-        if self.particles:
-            x_coords = [p['x'] for p in self.particles]
-            y_coords = [p['y'] for p in self.particles]
-            self.ax.scatter(x_coords, y_coords, c='yellow', s=20, alpha=0.8)
+        # Ultra-simple particle update: age, then compact live particles to the front
+        with self.lock:
+            n = self.n_particles
+            self.particle_life[:n] -= 1
+            alive = self.particle_life[:n] > 0
+            n_alive = int(np.count_nonzero(alive))
+            if n_alive < n:
+                self.particle_xy[:n_alive] = self.particle_xy[:n][alive]
+                self.particle_life[:n_alive] = self.particle_life[:n][alive]
+                self.n_particles = n_alive
+            
+            # Draw particles as simple dots
+            self.particles_scatter.set_offsets(self.particle_xy[:n_alive])
         
         # Status text
-        self.ax.text(-0.9, 0.9, f'Energy: {energy:.3f}', color='lime', fontsize=10)
-        self.ax.text(-0.9, 0.8, f'Beat: {"YES" if beat else "NO"}', 
-                    color='red' if beat else 'gray', fontsize=10)
+        self.energy_text.set_text(f'Energy: {energy:.3f}')
+        self.beat_text.set_text(f'Beat: {"YES" if beat else "NO"}')
+        self.beat_text.set_color('red' if beat else 'gray')
         
-        return []
+        return self._artists
     
     def start(self):
         """Start optimized audio processing"""
@@ -151,9 +142,10 @@ class OptimizedAudioBrain:
                               callback=self.audio_callback,
                               dtype=np.float32):
                 
-                # Start animation with longer interval
-                self.ani = animation.FuncAnimation(self.fig, self.update_frame, 
-                                            interval=100, blit=False, cache_frame_data=False)
+                # Start animation at the 5 FPS target directly
+                self.ani = animation.FuncAnimation(self.fig, self.update_frame,
+                                            init_func=self.init_frame,
+                                            interval=200, blit=True, cache_frame_data=False)
                 
                 plt.tight_layout()
                 plt.show(block=True)
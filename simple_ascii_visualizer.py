@@ -6,16 +6,24 @@ import sounddevice as sd
 import threading
 import time
 import os
+import sys
+import io
 import random
+from audio_kernels import process_audio
+
+# Cursor home + erase display; replaces spawning cls/clear every frame
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
 
 class SimpleASCIIVisualizer:
     def __init__(self):
         self.sample_rate = 22050
         self.buffer_size = 512
+        self._mono = np.zeros(self.buffer_size, dtype=np.float32)
         self.energy = 0
         self.beat = False
         self.lock = threading.Lock()
         self.running = True
+        self._frame = io.StringIO()
         
         # ASCII characters for different energy levels
         self.ascii_chars = {
@@ -36,11 +44,10 @@ class SimpleASCIIVisualizer:
     
     def audio_callback(self, indata, frames, time, status):
         """Process audio instantly"""
-        mono = np.mean(indata, axis=1) if indata.shape[1] > 1 else indata[:, 0]
+        mono = np.mean(indata, axis=1, out=self._mono[:len(indata)]) if indata.shape[1] > 1 else indata[:, 0]
         
         # Quick energy calculation
-        energy = np.mean(mono ** 2)
-        beat = energy > 0.01  # Lower threshold for sensitivity
+        energy, beat = process_audio(mono, 0.01)  # Lower threshold for sensitivity
         
         with self.lock:
             self.energy = energy
@@ -52,21 +59,24 @@ class SimpleASCIIVisualizer:
             energy = self.energy
             beat = self.beat
         
-        # Clear screen
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Build the whole frame in one reused buffer, starting with a screen clear
+        out = self._frame
+        out.seek(0)
+        out.truncate()
+        out.write(CLEAR_SCREEN)
         
-        print("*** SIMPLE ASCII MUSIC VISUALIZER ***")
-        print("=" * 50)
+        out.write("*** SIMPLE ASCII MUSIC VISUALIZER ***\n")
+        out.write("=" * 50 + "\n")
         
         # Energy bar
         bar_length = int(energy * 50)
-        energy_bar = "#" * bar_length + "." * (50 - bar_length)
-        print(f"Energy: [{energy_bar}] {energy:.4f}")
+        energy_bar = ("#" * bar_length).ljust(50, ".")
+        out.write(f"Energy: [{energy_bar}] {energy:.4f}\n")
         
         # Beat indicator
         beat_indicator = "*** BEAT DETECTED! ***" if beat else "... Waiting for beat..."
-        print(f"Status: {beat_indicator}")
-        print()
+        out.write(f"Status: {beat_indicator}\n")
+        out.write("\n")
         
         # ASCII Art based on energy level
         if beat and energy > 0.05:
@@ -91,18 +101,24 @@ class SimpleASCIIVisualizer:
             pattern = "." * 16
         
         # Draw multiple lines of pattern
+        doubled = pattern * 2
         for i in range(8):
             # Rotate pattern for animation effect
-            rotated = pattern[i:] + pattern[:i]
-            print(f"    {rotated}")
+            out.write(f"    {doubled[i:i + len(pattern)]}\n")
+        
+        out.write("\n")
+        out.write(f"[AUDIO] Listening... Energy: {energy:.6f}\n")
+        out.write("Press Ctrl+C to stop\n")
         
-        print()
-        print(f"[AUDIO] Listening... Energy: {energy:.6f}")
-        print("Press Ctrl+C to stop")
+        # One write and flush per frame
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
     
     def start(self):
         """Start the visualizer"""
         print("Starting Simple ASCII Visualizer...")
+        if os.name == 'nt':
+            os.system('')  # Enables ANSI escape handling in the Windows console
         print("Make sure Stereo Mix is enabled!")
         
         try:
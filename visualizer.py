@@ -4,14 +4,17 @@ Real-time audio visualization with multiple modes
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+import scipy.fft
 from scipy import signal
 from typing import Optional
-import threading
+
+from audio_kernels import magnitude_db
 
 
 class AudioVisualizer:
     def __init__(self, sample_rate: int = 44100, window_size: int = 2048):
         self.sample_rate = sample_rate
+        self._dt = 1.0 / sample_rate  # sample period, for the frequency axes and PSD scale
         self.window_size = window_size
         self.mode = 'waveform'  # 'waveform', 'fft', 'spectrogram'
         
@@ -24,12 +27,51 @@ class AudioVisualizer:
         self.line_wave = None
         self.line_fft = None
         self.spectrogram_im = None
-        self.spectrogram_data = []
         
         # Animation
         self.ani = None
-        self.audio_data = np.zeros(window_size)
-        self.data_lock = threading.Lock()
+        # Single-producer / single-consumer ring without a lock, as in AudioEngine:
+        # update_data (audio thread) publishes _write with one attribute store after
+        # copying, and _animate only reads the newest window_size of 4 * window_size
+        # samples, so the writer never reaches the region being read
+        self._ring = np.zeros(window_size * 4, dtype=np.float32)
+        self._write = 0
+        self.audio_data = np.zeros(window_size, dtype=np.float32)  # _animate's snapshot
+        
+        # Waveform mode: min/max of each bucket of samples, interleaved, so the
+        # line keeps its envelope with a quarter of the vertices
+        self._wave_bucket = max(1, window_size // 512)
+        n_buckets = window_size // self._wave_bucket
+        self._wave_x = np.arange(2 * n_buckets, dtype=np.float32) * (self._wave_bucket / 2)
+        self._wave_y = np.zeros(2 * n_buckets, dtype=np.float32)
+        
+        # FFT mode constants and scratch, fixed by window_size
+        self._hann = np.hanning(window_size).astype(np.float32)
+        self._freqs = np.fft.rfftfreq(window_size, self._dt)
+        self._windowed = np.empty(window_size, dtype=np.float32)
+        self._mag_buf = np.zeros(window_size // 2 + 1, dtype=np.float32)
+        
+        # Spectrogram mode: the STFT signal.spectrogram used to compute per frame
+        # (Tukey window, 1/8 overlap, constant detrend, one-sided PSD), planned once.
+        # Segments are a fixed power-of-two length, the FFT size pocketfft is fastest at;
+        # windows shorter than that are analysed as a single segment
+        nperseg = min(256, window_size)
+        self._spec_nperseg = nperseg
+        self._spec_step = nperseg - nperseg // 8
+        self._spec_win = signal.get_window(('tukey', 0.25), nperseg).astype(np.float32)
+        self._spec_freqs = np.fft.rfftfreq(nperseg, self._dt)
+        self._spec_scale = np.full(len(self._spec_freqs), 2 * self._dt / np.sum(self._spec_win ** 2),
+                                   dtype=np.float32)
+        self._spec_scale[0] /= 2  # DC and Nyquist bins are not doubled
+        if nperseg % 2 == 0:
+            self._spec_scale[-1] /= 2
+        n_segments = (window_size - nperseg) // self._spec_step + 1
+        self._spec_seg = np.empty((n_segments, nperseg), dtype=np.float32)
+        self._spec_power = np.empty((n_segments, len(self._spec_freqs)), dtype=np.float32)
+        # The last 100 frames' columns in a 2-D ring, oldest at _spec_col, and the
+        # same columns in time order for display; not-yet-filled columns are NaN
+        self._spec = np.empty((len(self._spec_freqs), 100 * n_segments), dtype=np.float32)
+        self._spec_view = np.full_like(self._spec, np.nan)
         
         # Setup key press handler
         self.fig.canvas.mpl_connect('key_press_event', self._on_key_press)
@@ -37,15 +79,38 @@ class AudioVisualizer:
         self._setup_plots()
     
     def _setup_plots(self):
-        """Initialize plot elements for all modes"""
-        self.ax.clear()
+        """Create the plot elements for all modes once; mode switches only toggle them"""
+        # Animated artists are left out of full redraws, so blitting restores a
+        # clean background and draws only the active mode's artist over it.
+        # Lines skip antialiasing and the image skips resampling: both are
+        # redrawn 20 times a second and Agg spends most of the frame on them
+        f = self._spec_freqs
+        # The lines get their fixed x axes here; frames only replace y
+        self.line_wave, = self.ax.plot(self._wave_x, self._wave_y, 'cyan', linewidth=1,
+                                       antialiased=False, animated=True)
+        self.line_fft, = self.ax.plot(self._freqs, self._mag_buf, 'lime', linewidth=1,
+                                      antialiased=False, animated=True)
+        self.spectrogram_im = self.ax.imshow(self._spec_view,
+                                             aspect='auto',
+                                             origin='lower',
+                                             cmap='plasma',
+                                             interpolation='nearest',
+                                             extent=[0, 100, f[0], f[-1]],
+                                             animated=True)
+        self._show_mode()
+    
+    def _show_mode(self):
+        """Label the axes, show only the current mode's artist and bind its frame method"""
+        self._animate_mode = getattr(self, f'_animate_{self.mode}')
+        self.line_wave.set_visible(self.mode == 'waveform')
+        self.line_fft.set_visible(self.mode == 'fft')
         
         if self.mode == 'waveform':
             self.ax.set_title('Audio Waveform (Press: w=waveform, f=FFT, s=spectrogram)')
             self.ax.set_xlabel('Time (samples)')
             self.ax.set_ylabel('Amplitude')
+            self.ax.set_xlim(0, self.window_size)
             self.ax.set_ylim(-1, 1)
-            self.line_wave, = self.ax.plot([], [], 'cyan', linewidth=1)
             
         elif self.mode == 'fft':
             self.ax.set_title('FFT Frequency Spectrum (Press: w=waveform, f=FFT, s=spectrogram)')
@@ -53,88 +118,134 @@ class AudioVisualizer:
             self.ax.set_ylabel('Magnitude (dB)')
             self.ax.set_xlim(0, self.sample_rate // 2)
             self.ax.set_ylim(-80, 0)
-            self.line_fft, = self.ax.plot([], [], 'lime', linewidth=1)
             
         elif self.mode == 'spectrogram':
             self.ax.set_title('Spectrogram (Press: w=waveform, f=FFT, s=spectrogram)')
             self.ax.set_xlabel('Time')
             self.ax.set_ylabel('Frequency (Hz)')
-            self.spectrogram_data = []
+            self.ax.set_xlim(0, 100)
+            self.ax.set_ylim(self._spec_freqs[0], self._spec_freqs[-1])
+        self._reset_spectrogram()
+    
+    def _reset_spectrogram(self):
+        """Drop the spectrogram history"""
+        self._spec.fill(np.nan)
+        self._spec_col = 0
+        self.spectrogram_im.set_visible(False)  # until the first frame is in
     
     def _on_key_press(self, event):
         """Handle key press events for mode switching"""
         if event.key == 'w':
             self.mode = 'waveform'
-            self._setup_plots()
         elif event.key == 'f':
             self.mode = 'fft'
-            self._setup_plots()
         elif event.key == 's':
             self.mode = 'spectrogram'
-            self._setup_plots()
+        else:
+            return
+        self._show_mode()
+        self.fig.canvas.draw_idle()  # new labels and limits, and a fresh blit background
     
     def update_data(self, audio_data: np.ndarray):
-        """Update audio data for visualization"""
-        with self.data_lock:
-            # Ensure consistent size
-            if len(audio_data) > self.window_size:
-                self.audio_data = audio_data[-self.window_size:]
-            else:
-                # Pad with zeros if needed
-                padded = np.zeros(self.window_size)
-                padded[:len(audio_data)] = audio_data
-                self.audio_data = padded
+        """Append the newest samples for visualization (never blocks)
+        
+        audio_data is float32 in [-1, 1], as AudioEngine delivers it; int16 PCM
+        is also accepted and scaled into the float32 ring as it is copied.
+        """
+        copy = self._copyto_int16 if audio_data.dtype == np.int16 else np.copyto
+        size = len(self._ring)
+        n = len(audio_data)
+        if n >= size:
+            copy(self._ring, audio_data[-size:])
+            self._write = 0
+            return
+        
+        end = self._write + n
+        if end <= size:
+            copy(self._ring[self._write:end], audio_data)
+        else:
+            split = size - self._write
+            copy(self._ring[self._write:], audio_data[:split])
+            copy(self._ring[:n - split], audio_data[split:])
+        self._write = end % size
+    
+    @staticmethod
+    def _copyto_int16(dst, src):
+        """Scale int16 PCM into a float32 slice in one pass"""
+        np.multiply(src, np.float32(1 / 32768), out=dst)
     
     def _animate(self, frame):
         """Animation function for matplotlib"""
-        with self.data_lock:
-            data = self.audio_data.copy()
+        # Snapshot the newest window_size samples in at most two copies
+        data = self.audio_data
+        write = self._write
+        start = write - self.window_size
+        if start >= 0:
+            np.copyto(data, self._ring[start:write])
+        else:
+            np.copyto(data[:-start], self._ring[start:])
+            np.copyto(data[-start:], self._ring[:write])
         
-        if self.mode == 'waveform':
-            self.line_wave.set_data(range(len(data)), data)
-            self.ax.set_xlim(0, len(data))
-            return [self.line_wave]
+        return self._animate_mode(data)
+    
+    def _animate_waveform(self, data):
+        """Waveform frame: min/max envelope of the window"""
+        y = self._wave_y
+        buckets = data[:len(y) // 2 * self._wave_bucket].reshape(-1, self._wave_bucket)
+        np.min(buckets, axis=1, out=y[0::2])
+        np.max(buckets, axis=1, out=y[1::2])
+        self.line_wave.set_ydata(y)
+        return [self.line_wave]
+    
+    def _animate_fft(self, data):
+        """FFT frame: dB magnitude spectrum of the Hann-windowed window"""
+        windowed = np.multiply(data, self._hann, out=self._windowed)
+        fft = scipy.fft.rfft(windowed, workers=1)
+        magnitude = self._mag_buf
+        magnitude_db(fft.real, fft.imag, magnitude)
         
-        elif self.mode == 'fft':
-            # Compute FFT
-            windowed = data * np.hanning(len(data))
-            fft = np.fft.rfft(windowed)
-            magnitude = 20 * np.log10(np.abs(fft) + 1e-10)
-            freqs = np.fft.rfftfreq(len(data), 1/self.sample_rate)
-            
-            self.line_fft.set_data(freqs, magnitude)
-            return [self.line_fft]
+        self.line_fft.set_ydata(magnitude)
+        return [self.line_fft]
+    
+    def _animate_spectrogram(self, data):
+        """Spectrogram frame: STFT columns of the window appended to the history"""
+        segments = np.lib.stride_tricks.sliding_window_view(data, self._spec_nperseg)
+        segments = segments[::self._spec_step]
         
-        elif self.mode == 'spectrogram':
-            # Compute spectrogram
-            if len(data) > 0:
-                f, t, Sxx = signal.spectrogram(data, self.sample_rate, 
-                                             nperseg=min(256, len(data)//4))
-                Sxx_db = 10 * np.log10(Sxx + 1e-10)
-                
-                # Keep rolling spectrogram
-                self.spectrogram_data.append(Sxx_db)
-                if len(self.spectrogram_data) > 100:  # Keep last 100 frames
-                    self.spectrogram_data.pop(0)
-                
-                if len(self.spectrogram_data) > 1:
-                    combined = np.hstack(self.spectrogram_data)
-                    
-                    if self.spectrogram_im is None:
-                        self.spectrogram_im = self.ax.imshow(combined, 
-                                                           aspect='auto', 
-                                                           origin='lower',
-                                                           cmap='plasma',
-                                                           extent=[0, len(self.spectrogram_data), 
-                                                                  f[0], f[-1]])
-                    else:
-                        self.spectrogram_im.set_array(combined)
-                        self.spectrogram_im.set_extent([0, len(self.spectrogram_data), 
-                                                       f[0], f[-1]])
-            
-            return [self.spectrogram_im] if self.spectrogram_im else []
+        # Detrend and window every segment, then one batched FFT
+        seg = self._spec_seg
+        np.subtract(segments, segments.mean(axis=1, keepdims=True), out=seg)
+        seg *= self._spec_win
+        spectrum = scipy.fft.rfft(seg, axis=1, workers=1)
+        # |X|^2 as re*re + im*im over the interleaved float32 pairs,
+        # with no sqrt to undo
+        pairs = spectrum.view(np.float32).reshape(*spectrum.shape, 2)
+        power = np.einsum('ijk,ijk->ij', pairs, pairs, out=self._spec_power)
+        power *= self._spec_scale
+        power += 1e-10
+        np.log10(power, out=power)
+        power *= 10
+        Sxx_db = power.T
+        
+        # Keep rolling spectrogram: write the new columns into the ring
+        n_cols = Sxx_db.shape[1]
+        col = self._spec_col
+        self._spec[:, col:col + n_cols] = Sxx_db
+        col = (col + n_cols) % self._spec.shape[1]
+        self._spec_col = col
+        
+        # Unroll it oldest first into the display buffer, which the image
+        # shows over a fixed 100-frame extent, so no layout is redone
+        split = self._spec.shape[1] - col
+        self._spec_view[:, :split] = self._spec[:, col:]
+        self._spec_view[:, split:] = self._spec[:, :col]
+        self.spectrogram_im.set_array(self._spec_view)
+        if not self.spectrogram_im.get_visible():
+            # Color scale from the first frame shown, as imshow would set it
+            self.spectrogram_im.autoscale()
+            self.spectrogram_im.set_visible(True)
         
-        return []
+        return [self.spectrogram_im]
     
     def start_visualization(self):
         """Start real-time visualization"""